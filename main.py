@@ -14,6 +14,8 @@ if __name__ == "__main__":
     
     # Check for --keep-json flag
     keep_json = "--keep-json" in sys.argv
+    # Check for --no-cache flag (always re-parse instead of reusing the cached model)
+    use_cache = "--no-cache" not in sys.argv
     
     # Auto-detect the first available VSS file
     vss_file = os.path.join('data', 'input', 'VehicleSignalSpecification.vspec')
@@ -27,9 +29,15 @@ if __name__ == "__main__":
         print(f"Auto-detected VSS file: {vss_file}")
         if keep_json:
             print("--keep-json flag detected: intermediate JSON file will be preserved")
+        if not use_cache:
+            print("--no-cache flag detected: cached signal model will not be used")
         from vss_parsing_engine.main import vss_to_json, json_to_vhal, cleanup_intermediate_files
-        vss_to_json(vss_file, json_output_file, config_dir)
-        json_to_vhal(json_output_file, vhal_output_dir, templates_dir)
+        signal_model, json_write = vss_to_json(vss_file, json_output_file, config_dir, use_cache=use_cache,
+                                               write_json=keep_json)
+        json_to_vhal(json_output_file, vhal_output_dir, templates_dir, signals=signal_model)
+        if json_write is not None:
+            json_write.result()
+        # Only --keep-json writes the JSON; remove one left by an earlier run
         cleanup_intermediate_files(json_output_file, keep_json=keep_json)
     else:
         print("Error: No VSS file detected. Please place a .vspec file in the 'data/input' directory.")
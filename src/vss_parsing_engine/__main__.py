@@ -0,0 +1,9 @@
+# File: src/vss_parsing_engine/__main__.py
+"""
+Allows running the tool as a module: python -m vss_parsing_engine <vss_file>
+"""
+
+from vss_parsing_engine.main import main
+
+if __name__ == "__main__":
+    main()
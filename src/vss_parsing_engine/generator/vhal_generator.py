@@ -1,17 +1,136 @@
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 import os
-import json
 import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from vss_parsing_engine.json_io import load_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on templates rendered concurrently
+MAX_RENDER_WORKERS = 8
+
+def _create_bytecode_cache():
+    """
+    Returns a FileSystemBytecodeCache so compiled templates persist across runs
+    (entries are keyed by template source checksum, so edited templates are
+    recompiled automatically), or None when no safe cache directory is available.
+
+    Jinja's default directory is a per-user, 0700 directory under the temp dir
+    whose ownership and permissions are checked, so other local users cannot
+    plant bytecode in it.
+    """
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        print(f"Warning: Template bytecode cache disabled: {e}")
+        return None
+
+def _extract_template_data(signal_items):
+    """
+    Build template property data and conversion mappings from
+    (path_or_index, signal_dict) pairs in a single pass.
+
+    Kept as a plain module-level function so the hot loop only touches
+    local names. Returns (properties, conversion_mappings, excluded_branches).
+    """
+    properties = []
+    conversion_mappings = []
+    excluded_branches = 0
+
+    get = dict.get
+    append_property = properties.append
+    append_mapping = conversion_mappings.append
+
+    for path_or_idx, signal in signal_items:
+        vhal_id_base = get(signal, 'vhal_id_base', 'UNKNOWN')
+        if vhal_id_base == 'UNKNOWN':
+            continue
+        node_type = get(signal, 'node_type', '')
+        # Branch nodes are organizational and should not become VehicleProperty entries
+        if node_type == 'branch':
+            excluded_branches += 1
+            continue
+
+        path = get(signal, 'path', path_or_idx if isinstance(path_or_idx, str) else '')
+        vhal_type = get(signal, 'vhal_type', 'MIXED')
+        vhal_access = get(signal, 'vhal_access', 'READ')
+        vhal_change_mode = get(signal, 'vhal_change_mode', 'ON_CHANGE')
+        vhal_area = get(signal, 'vhal_area', 'GLOBAL')
+        unit = get(signal, 'unit', '')
+        description = get(signal, 'description', '')
+        datatype = get(signal, 'datatype', '')
+
+        # Only include signals that have valid VHAL property IDs
+        if vhal_id_base:
+            # Templates only use the canonical vhal_* keys, so each value is stored once
+            append_property({
+                'vhal_id': get(signal, 'vhal_id', ''),  # String ID for template
+                'vhal_id_base': vhal_id_base,  # Hex ID for template
+                'name': get(signal, 'name', ''),
+                'path': path,
+                'vhal_type': vhal_type,
+                'vhal_access': vhal_access,
+                'vhal_change_mode': vhal_change_mode,
+                'vhal_area': vhal_area,
+                'vhal_property_group': get(signal, 'vhal_property_group', 'SYSTEM'),  # Property group for templates
+                'unit': unit,
+                'description': description,
+                'datatype': datatype,
+                'node_type': node_type
+            })
+
+        # Only convert signals that carry both a VSS datatype and a VHAL type
+        if datatype and get(signal, 'vhal_type'):
+            append_mapping({
+                'vss_path': path,
+                'vhal_property_id': vhal_id_base,
+                'vss_datatype': datatype,
+                'vhal_type': vhal_type,
+                'unit': unit,
+                'unit_multiplier': get(signal, 'unit_multiplier', 1.0),
+                'unit_offset': get(signal, 'unit_offset', 0.0),
+                'min_value': get(signal, 'min_value'),
+                'max_value': get(signal, 'max_value'),
+                'initial_value': get(signal, 'initial_value'),
+                'vhal_access': vhal_access,
+                'vhal_area': vhal_area,
+                'vhal_change_mode': vhal_change_mode,
+                'description': description
+            })
+
+    return properties, conversion_mappings, excluded_branches
 
 class VHALGenerator:
-    def __init__(self, json_file: str, templates_dir: str):
+    def __init__(self, json_file: str, templates_dir: str, verbose: bool = False, signals=None):
+        """
+        json_file is the unified signal model JSON; when the model is already in
+        memory pass it as 'signals' and json_file only names its source.
+        """
         self.json_file = json_file
         self.templates_dir = templates_dir
-        self.jinja_env = Environment(loader=FileSystemLoader(templates_dir))
-        self.signals = self.load_signals()
+        self.verbose = verbose  # Print extraction diagnostics instead of logging them at DEBUG
+        # Templates never change during a run, so skip Jinja's auto-reload stat
+        # calls and keep every compiled template in the environment cache.
+        self.jinja_env = Environment(loader=FileSystemLoader(templates_dir),
+                                     auto_reload=False, cache_size=-1,
+                                     bytecode_cache=_create_bytecode_cache())
+        self.signals = signals if signals is not None else self.load_signals()
+        # Handle both dict (path -> signal_data) and list formats; resolved once per load
+        if isinstance(self.signals, dict):
+            self._signal_items = self.signals.items()
+        else:
+            self._signal_items = list(enumerate(self.signals))
+        self._extracted = None
 
         # Files that should NEVER be generated (they are static AOSP files)
         self.static_files_dir = os.path.join(templates_dir, 'static')
+        self.static_files_map = {
+            'IVehicle.hal': 'IVehicle.hal',
+            'IVehicleCallback.hal': 'IVehicleCallback.hal',
+            'service.rc': 'android.hardware.automotive.vehicle@2.0-default-service.rc',
+            'service.xml': 'android.hardware.automotive.vehicle@2.0-default-service.xml'
+        }
         
         # Files to be generated
         self.generated_files = {
@@ -46,109 +165,120 @@ class VHALGenerator:
             'ConverterUtils.cpp.jinja2': 'src/ConverterUtils.cpp'
         }
 
+        # Compile every known template once up front
+        self._compiled_templates = {}
+        template_names = (list(self.generated_files) +
+                          [f'manual/{name}' for name in self.manual_templates] +
+                          [f'vss_converter/{name}' for name in self.vss_converter_files])
+        for template_name in template_names:
+            try:
+                self._compiled_templates[template_name] = self.jinja_env.get_template(template_name)
+            except Exception:
+                # Missing or broken templates are reported (and fall back) at generation time
+                pass
+
     def load_signals(self):
         """Load signals from JSON file"""
-        with open(self.json_file, 'r') as f:
-            return json.load(f)
+        with open(self.json_file, 'rb') as f:
+            return load_json_bytes(f.read())
+
+    def _get_template(self, template_name: str):
+        """Return a precompiled template, loading it on demand if it was not compiled"""
+        template = self._compiled_templates.get(template_name)
+        if template is None:
+            template = self.jinja_env.get_template(template_name)
+        return template
+
+    def _extract_all(self):
+        """
+        Extract property data and conversion mappings in a single pass over the
+        signals. The result is memoized so repeated generation runs are free.
+        """
+        if self._extracted is not None:
+            return self._extracted
 
-    def _extract_property_data(self):
-        """Extract and organize property data for templates"""
-        properties = []
-        signals_with_ids = 0
-        
-        # Debug: Print total signals and sample first few
         print(f"\nProcessing {len(self.signals)} signals for VHAL property extraction...")
-        if self.signals:
-            first_signal_path = list(self.signals.keys())[0] if isinstance(self.signals, dict) else "N/A"
-            print(f"First signal path: {first_signal_path}")
-            if isinstance(self.signals, dict) and first_signal_path in self.signals:
-                sample_signal = self.signals[first_signal_path]
-                print(f"Sample signal fields: {list(sample_signal.keys())}")
-        
-        # Handle both dict (path -> signal_data) and list formats
-        signal_items = self.signals.items() if isinstance(self.signals, dict) else enumerate(self.signals)
-        
-        for path_or_idx, signal in signal_items:
-            # Extract relevant data for VHAL generation
-            property_data = {
-                'id': signal.get('vhal_id_base', 'UNKNOWN'),  # Use vhal_id_base instead of aospId
-                'vhal_id': signal.get('vhal_id', ''),  # String ID for template
-                'vhal_id_base': signal.get('vhal_id_base', 'UNKNOWN'),  # Hex ID for template
-                'name': signal.get('name', ''),
-                'path': signal.get('path', path_or_idx if isinstance(path_or_idx, str) else ''),
-                'type': signal.get('vhal_type', 'MIXED'),  # Use vhal_type instead of vhal_data_type
-                'vhal_type': signal.get('vhal_type', 'MIXED'),  # Also provide as vhal_type for templates
-                'access': signal.get('vhal_access', 'READ'),  # Use vhal_access
-                'vhal_access': signal.get('vhal_access', 'READ'),  # Also provide as vhal_access for templates
-                'change_mode': signal.get('vhal_change_mode', 'ON_CHANGE'),  # Use vhal_change_mode
-                'vhal_change_mode': signal.get('vhal_change_mode', 'ON_CHANGE'),  # Also provide as vhal_change_mode for templates
-                'areas': signal.get('vhal_area', 'GLOBAL'),  # Use vhal_area
-                'vhal_area': signal.get('vhal_area', 'GLOBAL'),  # Also provide as vhal_area for templates
-                'vhal_property_group': signal.get('vhal_property_group', 'SYSTEM'),  # Property group for templates
-                'unit': signal.get('unit', ''),
-                'description': signal.get('description', ''),
-                'datatype': signal.get('datatype', ''),
-                'node_type': signal.get('node_type', '')
-            }
-            
-            # Only include signals that have valid VHAL properties AND are not branch nodes
-            # Branch nodes are organizational and should not become VehicleProperty entries
-            if (property_data['id'] != 'UNKNOWN' and property_data['id'] and 
-                property_data['node_type'] not in ['branch']):
-                properties.append(property_data)
-                signals_with_ids += 1
-                
-                # Debug: Log first few processed signals
-                if signals_with_ids <= 5:
-                    print(f"  ✓ Signal: {property_data['name']} -> ID: {property_data['id']}, Type: {property_data['type']}, Node Type: {property_data['node_type']}")
-            elif property_data['node_type'] == 'branch' and property_data['id'] != 'UNKNOWN':
-                # Debug: Log branch nodes that are being excluded
-                if signals_with_ids <= 5:
-                    print(f"  ⚠ Excluded branch node: {property_data['name']} -> ID: {property_data['id']}, Node Type: {property_data['node_type']}")
         
+        properties, conversion_mappings, excluded_branches = _extract_template_data(self._signal_items)
+        signals_with_ids = len(properties)
+
+        # Emit diagnostics once, outside the hot loop
+        log = print if self.verbose else logger.debug
+        if self.signals and isinstance(self.signals, dict):
+            first_signal_path = next(iter(self.signals))
+            log(f"First signal path: {first_signal_path}")
+            log(f"Sample signal fields: {list(self.signals[first_signal_path].keys())}")
+        for p in properties[:5]:
+            log(f"  ✓ Signal: {p['name']} -> ID: {p['vhal_id_base']}, Type: {p['vhal_type']}, Node Type: {p['node_type']}")
+        if excluded_branches:
+            log(f"  ⚠ Excluded {excluded_branches} branch nodes carrying VHAL IDs")
+
         print(f"Successfully extracted {signals_with_ids} signals with VHAL property IDs out of {len(self.signals)} total signals.")
         
         if signals_with_ids == 0:
             print("WARNING: No signals found with valid VHAL property IDs. The generated files may be empty.")
             print("This usually means the enrichment process didn't generate vhal_id_base fields correctly.")
         
-        return properties
+        self._extracted = (properties, conversion_mappings)
+        return self._extracted
+
+    @property
+    def properties(self):
+        """Property data for templates, extracted once per generator"""
+        return self._extract_all()[0]
+
+    @property
+    def conversion_mappings(self):
+        """VSS to VHAL conversion mappings, extracted once per generator"""
+        return self._extract_all()[1]
 
     def _copy_static_files(self, output_dir: str):
         """Copy static AOSP files that should not be generated"""
-        if not os.path.exists(self.static_files_dir):
+        # One directory scan instead of a stat per static file
+        try:
+            with os.scandir(self.static_files_dir) as entries:
+                available_files = {entry.name for entry in entries}
+        except FileNotFoundError:
             print(f"Warning: Static files directory not found: {self.static_files_dir}")
             return
             
-        static_files_map = {
-            'IVehicle.hal': 'IVehicle.hal',
-            'IVehicleCallback.hal': 'IVehicleCallback.hal',
-            'service.rc': 'android.hardware.automotive.vehicle@2.0-default-service.rc',
-            'service.xml': 'android.hardware.automotive.vehicle@2.0-default-service.xml'
-        }
-        
-        for src_file, dest_path in static_files_map.items():
+        for src_file, dest_path in self.static_files_map.items():
             src_path = os.path.join(self.static_files_dir, src_file)
             dest_full_path = os.path.join(output_dir, dest_path)
             
-            if os.path.exists(src_path):
-                os.makedirs(os.path.dirname(dest_full_path), exist_ok=True)
-                shutil.copy2(src_path, dest_full_path)
+            if src_file in available_files:
+                shutil.copyfile(src_path, dest_full_path)
                 print(f"Copied static file: {dest_path}")
             else:
                 print(f"Warning: Static file not found: {src_path}")
 
-    def _generate_manual_files(self, output_dir: str, context: dict):
+    def _create_output_dirs(self, output_dir: str):
+        """Create every output subdirectory once, before any file is written"""
+        output_files = (*self.generated_files.values(), *self.manual_templates.values(),
+                        *self.vss_converter_files.values(), *self.static_files_map.values())
+        for directory in {os.path.dirname(os.path.join(output_dir, f)) for f in output_files}:
+            os.makedirs(directory, exist_ok=True)
+
+    def _render_template(self, template_name: str, context: dict, output_path: str):
+        """Render a single template and write it to output_path"""
+        # Render to one string and write it with a single call (UTF-8, no newline
+        # translation); streaming issued one write per template event, which is slower
+        output = self._get_template(template_name).render(context)
+        with open(output_path, 'wb') as f:
+            f.write(output.encode('utf-8'))
+
+    def _generate_manual_files(self, output_dir: str, context: dict, executor: ThreadPoolExecutor):
         """Generate manual files from Jinja2 templates with property data"""
+        # Always regenerate manual files to include latest property data
+        pending = []
         for template_name, output_filename in self.manual_templates.items():
             output_path = os.path.join(output_dir, output_filename)
-            # Always regenerate manual files to include latest property data
+            future = executor.submit(self._render_template, f'manual/{template_name}', context, output_path)
+            pending.append((template_name, output_filename, output_path, future))
+
+        for template_name, output_filename, output_path, future in pending:
             try:
-                template = self.jinja_env.get_template(f'manual/{template_name}')
-                content = template.render(context)
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, 'w') as f:
-                    f.write(content)
+                future.result()
                 print(f"Generated enhanced manual implementation: {output_filename}")
             except Exception as e:
                 print(f"Warning: Could not generate {template_name}: {e}")
@@ -156,43 +286,16 @@ class VHALGenerator:
                 # Fallback to old behavior if template is not found
                 template_path = os.path.join(self.templates_dir, 'manual', template_name)
                 if os.path.exists(template_path):
-                    shutil.copy2(template_path, output_path)
+                    shutil.copyfile(template_path, output_path)
                     print(f"Copied static template: {output_filename}")
     
     def _extract_conversion_data(self):
         """Extract VSS to VHAL conversion data for dynamic converter generation"""
-        conversion_mappings = []
-        
-        signal_items = self.signals.items() if isinstance(self.signals, dict) else enumerate(self.signals)
-        
-        for path_or_idx, signal in signal_items:
-            # Only process signals that have VHAL mappings and are not branch nodes
-            if (signal.get('vhal_id_base', 'UNKNOWN') != 'UNKNOWN' and
-                signal.get('node_type', '') not in ['branch'] and
-                signal.get('datatype') and signal.get('vhal_type')):
-                
-                conversion_data = {
-                    'vss_path': signal.get('path', path_or_idx if isinstance(path_or_idx, str) else ''),
-                    'vhal_property_id': signal.get('vhal_id_base', ''),
-                    'vss_datatype': signal.get('datatype', ''),
-                    'vhal_type': signal.get('vhal_type', 'MIXED'),
-                    'unit': signal.get('unit', ''),
-                    'unit_multiplier': signal.get('unit_multiplier', 1.0),
-                    'unit_offset': signal.get('unit_offset', 0.0),
-                    'min_value': signal.get('min_value'),
-                    'max_value': signal.get('max_value'),
-                    'initial_value': signal.get('initial_value'),
-                    'vhal_access': signal.get('vhal_access', 'READ'),
-                    'vhal_area': signal.get('vhal_area', 'GLOBAL'),
-                    'vhal_change_mode': signal.get('vhal_change_mode', 'ON_CHANGE'),
-                    'description': signal.get('description', '')
-                }
-                conversion_mappings.append(conversion_data)
-        
+        conversion_mappings = self.conversion_mappings
         print(f"Generated {len(conversion_mappings)} VSS to VHAL conversion mappings")
         return conversion_mappings
     
-    def _generate_vss_converter_files(self, output_dir: str, context: dict):
+    def _generate_vss_converter_files(self, output_dir: str, context: dict, executor: ThreadPoolExecutor):
         """Generate VSS converter system files"""
         print("\nGenerating VSS converter system...")
         
@@ -204,14 +307,16 @@ class VHALGenerator:
             'total_signals': len(conversion_mappings)
         }
         
+        pending = []
         for template_name, output_filename in self.vss_converter_files.items():
             output_path = os.path.join(output_dir, output_filename)
+            future = executor.submit(self._render_template, f'vss_converter/{template_name}',
+                                     converter_context, output_path)
+            pending.append((template_name, output_filename, future))
+
+        for template_name, output_filename, future in pending:
             try:
-                template = self.jinja_env.get_template(f'vss_converter/{template_name}')
-                content = template.render(converter_context)
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, 'w') as f:
-                    f.write(content)
+                future.result()
                 print(f"Generated VSS converter: {output_filename}")
             except Exception as e:
                 print(f"Warning: Could not generate VSS converter {template_name}: {e}")
@@ -219,26 +324,33 @@ class VHALGenerator:
     def generate_vhal_files(self, output_dir: str):
         """Generate VHAL files including the VSS converter system"""
         print("\nGenerating VHAL files...")
-        os.makedirs(output_dir, exist_ok=True)
-        properties = self._extract_property_data()
-        context = {'properties': properties, 'vss_file_path': self.json_file}
+        self._create_output_dirs(output_dir)
+        context = {'properties': self.properties, 'vss_file_path': self.json_file}
 
-        # Generate core VHAL files
-        for template_name, output_name in self.generated_files.items():
-            template = self.jinja_env.get_template(template_name)
-            content = template.render(context)
-            output_path = os.path.join(output_dir, output_name)
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, 'w') as f:
-                f.write(content)
-            print(f"Generated {output_name}")
-
-        # Generate VSS converter system
-        self._generate_vss_converter_files(output_dir, context)
-        
-        # Copy static files and generate manual templates
-        self._copy_static_files(output_dir)
-        self._generate_manual_files(output_dir, context)
+        # Templates render independently, so overlap them on a shared pool
+        with ThreadPoolExecutor(max_workers=MAX_RENDER_WORKERS) as executor:
+            # Generate core VHAL files; a failure stops generation before any other output
+            core_pending = []
+            for template_name, output_name in self.generated_files.items():
+                output_path = os.path.join(output_dir, output_name)
+                future = executor.submit(self._render_template, template_name, context, output_path)
+                core_pending.append((output_name, future))
+
+            for index, (output_name, future) in enumerate(core_pending):
+                try:
+                    future.result()
+                except Exception:
+                    for _, pending_future in core_pending[index + 1:]:
+                        pending_future.cancel()
+                    raise
+                print(f"Generated {output_name}")
+
+            # Generate VSS converter system
+            self._generate_vss_converter_files(output_dir, context, executor)
+
+            # Copy static files and generate manual templates
+            self._copy_static_files(output_dir)
+            self._generate_manual_files(output_dir, context, executor)
         
         print("\n" + "="*70)
         print("VHAL files generation complete!")
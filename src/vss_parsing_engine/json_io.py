@@ -0,0 +1,65 @@
+# File: src/vss_parsing_engine/json_io.py
+
+"""
+Writes and reads the unified signal model JSON, using orjson (when installed)
+only where it gives exactly the same values as the standard json module.
+"""
+
+import json
+import math
+
+try:
+    import orjson  # Optional: C-implemented JSON serializer and parser
+except ImportError:
+    orjson = None
+
+# Maps every digit byte to b'0' and any other byte to b' ', so runs of digits can be found with one search
+_DIGITS_TO_ZERO = bytes(0x30 if 0x30 <= b <= 0x39 else 0x20 for b in range(256))
+# orjson reads integers outside the 64-bit range as floats; such integers have at least 19 digits
+_LONG_DIGIT_RUN = b'0' * 19
+
+def _contains_non_finite_float(data) -> bool:
+    """Returns True if data (nested dicts, lists and tuples) holds a NaN or infinite float."""
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        value_type = type(value)
+        if value_type is float:
+            if not math.isfinite(value):
+                return True
+        elif value_type is dict:
+            pending.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            pending.extend(value)
+    return False
+
+def dump_json_bytes(data) -> bytes:
+    """
+    Serializes data as 2-space indented UTF-8 JSON. orjson is used when it is
+    lossless for the data; NaN/infinite floats (which orjson writes as null) and
+    integers beyond 64 bits (which it rejects) are written with the json module,
+    as NaN/Infinity tokens and exact integers, so load_json_bytes reads them back.
+    """
+    if orjson is not None:
+        try:
+            json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            json_bytes = None # e.g. an integer beyond 64 bits
+        # Without any null in the output no float was replaced, so the walk is rarely needed
+        if json_bytes is not None and (b'null' not in json_bytes or not _contains_non_finite_float(data)):
+            return json_bytes
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def load_json_bytes(data: bytes):
+    """
+    Decodes UTF-8 JSON bytes. orjson is used when it is lossless for the input;
+    NaN/Infinity tokens (which orjson rejects) and very long integers (which it
+    turns into floats) are decoded with the json module instead.
+    Raises ValueError for invalid JSON.
+    """
+    if orjson is not None and _LONG_DIGIT_RUN not in data.translate(_DIGITS_TO_ZERO):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass # Possibly NaN/Infinity; the json module below reads those or reports the error
+    return json.loads(data)
@@ -1,18 +1,22 @@
-# File: VSS-Parsing-Engine/main.py
+# File: src/vss_parsing_engine/main.py
 
 import os
 import sys
-import json
-import shutil
+import glob
+import hashlib
+import tempfile
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the src directory to Python path for internal imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+try:
+    from yaml import CSafeLoader as YamlLoader  # LibYAML bindings, much faster
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
-from vss_parsing_engine.parsers.vss_parser import VSSParser
-from vss_parsing_engine.processing.property_enricher import PropertyEnricher
-from vss_parsing_engine.processing.signal_merger import SignalMerger
-from vss_parsing_engine.generator.vhal_generator import VHALGenerator
+from vss_parsing_engine.json_io import dump_json_bytes, load_json_bytes
+
+# The pipeline stages (VSSParser, PropertyEnricher, SignalMerger, VHALGenerator)
+# are imported inside vss_to_json/json_to_vhal so usage/error exits stay cheap.
 
 def print_banner():
     """Print tool banner"""
@@ -25,7 +29,7 @@ def load_yaml_config(filepath):
     """Helper function to load a YAML configuration file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+            return yaml.load(f, Loader=YamlLoader) or {}
     except FileNotFoundError:
         print(f"Error: Configuration file not found at {filepath}")
         sys.exit(1)
@@ -33,8 +37,121 @@ def load_yaml_config(filepath):
         print(f"Error parsing YAML file {filepath}: {e}")
         sys.exit(1)
 
-def vss_to_json(vss_file: str, json_output_file: str, config_dir: str):
-    """Convert VSS to JSON intermediate format"""
+# Files whose contents determine the unified signal model besides the .vspec itself
+CONFIG_FILES = ("typemap.yml", "property_heuristics.yml", "unit_conversion_rules.yml")
+PIPELINE_MODULES = ("parsers/vss_parser.py", "processing/property_enricher.py",
+                    "processing/signal_merger.py", "models/signal.py", "models/constants.py",
+                    "json_io.py")
+
+def get_model_cache_dir() -> str:
+    """
+    Returns the per-user directory holding cached signal models:
+    $VSS_PARSING_ENGINE_CACHE_DIR if set, otherwise %LOCALAPPDATA% on Windows
+    and $XDG_CACHE_HOME (default ~/.cache) elsewhere.
+    """
+    cache_dir = os.environ.get("VSS_PARSING_ENGINE_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    if os.name == 'nt':
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "vss_parsing_engine")
+
+def get_model_cache_path(vss_file: str, config_dir: str, file_resolver: dict) -> str:
+    """
+    Returns the path of the cached unified signal model for the current inputs.
+    The file lives in the per-user cache directory, named after the VSS file's
+    absolute path plus a hash of every VSS file handed to the parser (paths and
+    contents), the enrichment configs and the pipeline sources, so changing the
+    spec, rules or code invalidates the cache automatically.
+    """
+    source_id = hashlib.blake2b(os.path.abspath(vss_file).encode('utf-8'), digest_size=8).hexdigest()
+    digest = hashlib.blake2b(digest_size=8)
+    for vss_path, vss_content in sorted(file_resolver.items()):
+        digest.update(vss_path.encode('utf-8') + b'\0' + vss_content.encode('utf-8') + b'\0')
+    package_dir = os.path.dirname(__file__)
+    dependencies = [os.path.join(config_dir, name) for name in CONFIG_FILES]
+    dependencies += [os.path.join(package_dir, name) for name in PIPELINE_MODULES]
+    for path in dependencies:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(path.encode('utf-8'))
+    return os.path.join(get_model_cache_dir(), f"{source_id}.{digest.hexdigest()}.cache")
+
+def write_model_cache(json_bytes: bytes, cache_path: str):
+    """
+    Stores the serialized model at cache_path, replacing caches of the same VSS
+    file from older inputs. The cache is optional, so failures only print a warning.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        source_id = os.path.basename(cache_path).split('.', 1)[0]
+        for stale_cache in glob.glob(os.path.join(glob.escape(cache_dir), source_id + ".*.cache")):
+            if stale_cache != cache_path:
+                os.remove(stale_cache)
+        # Write a temporary file and rename it into place, so an interrupted write
+        # never leaves a truncated cache behind
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=os.path.basename(cache_path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_bytes)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError as e:
+        print(f"Warning: Could not write cached signal model {cache_path}: {e}")
+
+def write_signal_model(unified_signal_model_data, json_output_file: str, cache_path: str = None):
+    """Writes the unified signal model to the JSON file and/or the model cache."""
+    json_bytes = dump_json_bytes(unified_signal_model_data)
+    if json_output_file:
+        with open(json_output_file, 'wb') as f:
+            f.write(json_bytes)
+        print(f"Unified signal model saved to: {json_output_file}")
+
+    if cache_path:
+        # Keep a copy for the next run
+        write_model_cache(json_bytes, cache_path)
+
+def read_cached_signal_model(cache_path: str):
+    """
+    Returns (model, model_json_bytes) from the model cache, or None when there is
+    no usable cache (missing, unreadable or corrupt files count as a cache miss).
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_model_bytes = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Warning: Could not read cached signal model {cache_path}: {e}")
+        return None
+    try:
+        model = load_json_bytes(cached_model_bytes)
+    except ValueError as e:
+        print(f"Warning: Ignoring corrupt cached signal model {cache_path}: {e}")
+        return None
+    return model, cached_model_bytes
+
+def vss_to_json(vss_file: str, json_output_file: str, config_dir: str, use_cache: bool = True,
+                write_json: bool = True):
+    """
+    Convert VSS to JSON intermediate format.
+
+    Returns (unified_signal_model_data, json_write) so the caller can hand the
+    model straight to json_to_vhal. The JSON file (only when write_json is set)
+    and the model cache are written on a background thread; json_write is the
+    Future for that write, or None when there is nothing left to write. Call
+    json_write.result() before relying on the files.
+
+    The model cache is keyed on the VSS input, configs and pipeline sources;
+    use_cache=False neither reads nor writes it.
+    """
     print("\nStep 1: Converting VSS to JSON...")
 
     if not os.path.exists(vss_file):
@@ -50,14 +167,30 @@ def vss_to_json(vss_file: str, json_output_file: str, config_dir: str):
         print(f"Error loading VSS file: {e}")
         sys.exit(1)
 
+    # Every VSS file the parser can see; #include directives resolve only against these
+    file_resolver = {vss_file: vss_content}
+    cache_path = get_model_cache_path(vss_file, config_dir, file_resolver)
+    cached = read_cached_signal_model(cache_path) if use_cache else None
+    if cached is not None:
+        unified_signal_model_data, cached_model_bytes = cached
+        print(f"VSS input unchanged since last run, reusing cached signal model: {cache_path}")
+        if write_json:
+            with open(json_output_file, 'wb') as f:
+                f.write(cached_model_bytes)
+            print(f"Unified signal model saved to: {json_output_file}")
+        return unified_signal_model_data, None
+
+    from vss_parsing_engine.parsers.vss_parser import VSSParser
+    from vss_parsing_engine.processing.property_enricher import PropertyEnricher
+    from vss_parsing_engine.processing.signal_merger import SignalMerger
+
     try:
         # Load configuration files
         print("Loading enrichment configurations...")
-        typemap = load_yaml_config(os.path.join(config_dir, "typemap.yml"))
-        heuristics = load_yaml_config(os.path.join(config_dir, "property_heuristics.yml"))
-        unit_rules = load_yaml_config(os.path.join(config_dir, "unit_conversion_rules.yml"))
+        typemap, heuristics, unit_rules = (load_yaml_config(os.path.join(config_dir, name))
+                                           for name in CONFIG_FILES)
 
-        vss_parser = VSSParser(file_resolver={vss_file: vss_content})
+        vss_parser = VSSParser(file_resolver=file_resolver)
         
         print("Parsing VSS signals...")
         all_vss_signals = vss_parser.load_vss_signals(vss_file)
@@ -74,28 +207,38 @@ def vss_to_json(vss_file: str, json_output_file: str, config_dir: str):
             typemap=typemap,
             unit_conversion_rules=unit_rules
         )
-        enriched_vss_signals = enricher.enrich_signals(all_vss_signals)
+        enriched_vss_signals = enricher.enrich_signals(all_vss_signals, leaf_paths=vss_parser.leaf_paths)
 
         print("Merging and flattening signals...")
         merger = SignalMerger()
-        unified_signal_model_data = merger.merge_and_flatten_signals(enriched_vss_signals)
-
-        with open(json_output_file, 'w', encoding='utf-8') as f:
-            json.dump(unified_signal_model_data, f, indent=2)
+        unified_signal_model_data = merger.merge_and_flatten_signals(enriched_vss_signals, leaf_paths=vss_parser.leaf_paths)
 
-        print(f"Unified signal model saved to: {json_output_file}")
         print(f"Total signals processed: {len(unified_signal_model_data)}")
         
     except Exception as e:
         print(f"Error during VSS to JSON conversion: {e}")
         sys.exit(1)
 
-def json_to_vhal(json_file: str, output_dir: str, templates_dir: str):
-    """Generate VHAL structure from JSON"""
+    json_write = None
+    if write_json or use_cache:
+        # Serializing and writing overlap with VHAL generation, which only reads the model
+        writer = ThreadPoolExecutor(max_workers=1)
+        json_write = writer.submit(write_signal_model, unified_signal_model_data,
+                                   json_output_file if write_json else None,
+                                   cache_path if use_cache else None)
+        writer.shutdown(wait=False)
+    return unified_signal_model_data, json_write
+
+def json_to_vhal(json_file: str, output_dir: str, templates_dir: str, signals=None):
+    """
+    Generate VHAL structure from JSON. When the in-memory signal model is
+    passed as 'signals' it is used directly and json_file is not read.
+    """
     print("\nStep 2: Generating VHAL structure from JSON...")
+    from vss_parsing_engine.generator.vhal_generator import VHALGenerator
     
     try:
-        vhal_generator = VHALGenerator(json_file, templates_dir)
+        vhal_generator = VHALGenerator(json_file, templates_dir, signals=signals)
         vhal_generator.generate_vhal_files(output_dir)
         
         print(f"VHAL files generated successfully!")
@@ -114,6 +257,18 @@ def cleanup_intermediate_files(json_file: str, keep_json: bool = False):
         except OSError as e:
             print(f"Error cleaning up file {json_file}: {e}")
 
+def stop_json_write(json_write):
+    """
+    Cancels the background JSON/cache write if it has not started yet, otherwise
+    waits for it, so no file is written after an aborted run has cleaned up.
+    """
+    if json_write is None or json_write.cancel():
+        return
+    try:
+        json_write.result()
+    except Exception:
+        pass # The run is already failing; its error is the one reported
+
 def main():
     """Main entry point"""
     print_banner()
@@ -121,7 +276,7 @@ def main():
     if len(sys.argv) < 2:
         print("\nError: No input file specified")
         print("\nUsage:")
-        print("   python main.py <vss_file>")
+        print("   python main.py <vss_file> [--keep-json] [--no-cache]")
         print("\nExample:")
         print("   python main.py data/input/VehicleSignalSpecification.vspec")
         sys.exit(1)
@@ -133,20 +288,22 @@ def main():
     templates_dir = os.path.join(os.path.dirname(__file__), "generator/templates")
     
     keep_json = "--keep-json" in sys.argv
+    use_cache = "--no-cache" not in sys.argv # Always re-parse instead of reusing the cached model
     
     print(f"Input VSS file: {vss_file}")
     print(f"Output VHAL directory: {vhal_output_dir}")
     
+    json_write = None
     try:
-        # Step 1: VSS to JSON
-        vss_to_json(vss_file, json_output_file, config_dir)
+        # Step 1: VSS to JSON (the JSON file is only written with --keep-json)
+        signal_model, json_write = vss_to_json(vss_file, json_output_file, config_dir, use_cache=use_cache,
+                                               write_json=keep_json)
         
-        # Step 2: JSON to VHAL
-        json_to_vhal(json_output_file, vhal_output_dir, templates_dir)
+        # Step 2: JSON to VHAL, straight from the in-memory model
+        json_to_vhal(json_output_file, vhal_output_dir, templates_dir, signals=signal_model)
         
-        # Cleanup intermediate files
-        if not keep_json:
-            cleanup_intermediate_files(json_output_file)
+        if json_write is not None:
+            json_write.result()
         
         # Success summary
         print("\n" + "=" * 70)
@@ -160,16 +317,21 @@ def main():
         
         if keep_json:
             print(f"Intermediate JSON file preserved: {json_output_file}")
+        else:
+            # Only --keep-json writes the JSON; remove one left by an earlier run
+            cleanup_intermediate_files(json_output_file, keep_json)
         
         print("\nReady for Android VHAL integration!")
         
     except KeyboardInterrupt:
         print("\n\n Process interrupted by user")
-        cleanup_intermediate_files(json_output_file, False)
+        stop_json_write(json_write)
+        cleanup_intermediate_files(json_output_file, keep_json)
         sys.exit(1)
     except Exception as e:
         print(f"\nUnexpected error: {e}")
-        cleanup_intermediate_files(json_output_file, False)
+        stop_json_write(json_write)
+        cleanup_intermediate_files(json_output_file, keep_json)
         sys.exit(1)
 
 if __name__ == "__main__":
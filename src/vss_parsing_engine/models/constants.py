@@ -39,6 +39,9 @@ class VssDataType:
     FLOAT_ARRAY = "float[]"
     # ... and so on for other VSS array types
 
+# VSS node types that carry data, as opposed to 'branch' containers.
+VSS_LEAF_NODE_TYPES = frozenset({"signal", "sensor", "actuator", "attribute"})
+
 
 # --- Android VHAL Property Types (VehiclePropertyType) ---
 # These correspond to the values defined in VehicleProperty.aidl (or VehicleProperty.txt)
@@ -9,10 +9,14 @@ It holds both the original VSS signal information and the enriched
 Android VHAL-like properties derived during processing.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List, Union
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, List, Union, Callable
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10; older versions get a regular (dict-backed) class
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class SignalNode:
     """
     Represents a single node (either a signal or a branch) from the VSS hierarchy,
@@ -51,36 +55,78 @@ class SignalNode:
     # This is a dictionary where keys are child names and values are other SignalNode objects.
     children: Dict[str, 'SignalNode'] = field(default_factory=dict)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """
-        Converts the SignalNode object into a dictionary representation,
-        omitting entries where the value is None.
-        Children are recursively converted, and the 'children' key is omitted
-        if there are no actual children.
-        """
-        node_dict = {}
-        
-        # Iterate over all fields of the dataclass
-        # Using self.__dict__.items() to get all instance attributes
-        for field_name, field_value in self.__dict__.items():
-            if field_name == "children":
-                # Recursively convert children to dictionaries
-                processed_children = {}
-                # Only iterate if field_value (self.children) is not None and not empty
-                if field_value: 
-                    for k, v in field_value.items():
-                        if isinstance(v, SignalNode): # Ensure it's a SignalNode before calling to_dict
-                            processed_children[k] = v.to_dict()
-                        else:
-                            # Fallback for unexpected types, though ideally all children are SignalNodes
-                            processed_children[k] = v 
-                
-                # Only include the 'children' key if there are actual processed children
-                if processed_children:
-                    node_dict[field_name] = processed_children
+    # --- Attributes assigned by the PropertyEnricher, in the order it sets them ---
+    # (declared after 'children' so the exported JSON keeps its established key order)
+    vhal_access: Optional[str] = None  # Inferred VHAL access mode (VhalAccessMode)
+    vhal_change_mode: Optional[str] = None  # Inferred VHAL change mode (VhalChangeMode)
+    vhal_area: Optional[str] = None  # Inferred VHAL area type (VhalAreaType)
+    initial_value: Optional[Any] = None  # Initial value from the VSS default or the VHAL type
+    vhal_id: Optional[str] = None  # VHAL property name derived from the VSS path
+    vhal_id_base: Optional[str] = None  # Hex base ID derived from the VSS path hash
+    vhal_property_group: Optional[str] = None  # VHAL property group (VhalPropertyGroup)
+
+
+def _build_field_writer(cls, include_children: bool) -> Callable[[Any], Any]:
+    """
+    Generates a function that writes one SignalNode's non-None fields into a
+    new dict, with one statement per dataclass field, so no reflection over the
+    instance happens per node.
+
+    With include_children=False the 'children' field is left out entirely
+    (SignalNode.to_dict_self_only). Otherwise an empty 'children' dict is put in
+    its field position for nodes that have children, and (node_dict,
+    children_dict) is returned so the caller can fill it in.
+    """
+    function_name = "write_fields_with_children" if include_children else "to_dict_self_only"
+    lines = [f"def {function_name}(self):", "    node_dict = {}"]
+    for field_name in (f.name for f in fields(cls)):
+        if field_name == "children":
+            if include_children:
+                # Only include 'children' when there are actual children
+                lines.append("    children_dict = None")
+                lines.append("    if self.children:")
+                lines.append("        children_dict = node_dict['children'] = {}")
+        else:
+            lines.append(f"    value = self.{field_name}")
+            lines.append(f"    if value is not None: node_dict[{field_name!r}] = value")
+    lines.append("    return node_dict, children_dict" if include_children else "    return node_dict")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace[function_name]
+
+
+_write_fields_with_children = _build_field_writer(SignalNode, include_children=True)
+
+
+def _to_dict(self) -> Dict[str, Any]:
+    """
+    Converts the SignalNode object into a dictionary representation,
+    omitting entries where the value is None.
+    Children are converted as well, and the 'children' key is omitted
+    if there are no actual children.
+    """
+    # Walk the subtree with an explicit stack instead of recursing once per node
+    node_dict, children_dict = _write_fields_with_children(self)
+    pending = [(self.children, children_dict)] if children_dict is not None else []
+    while pending:
+        children, children_dict = pending.pop()
+        for key, child in children.items():
+            if isinstance(child, SignalNode):
+                child_dict, grandchildren_dict = _write_fields_with_children(child)
+                if grandchildren_dict is not None:
+                    pending.append((child.children, grandchildren_dict))
+                children_dict[key] = child_dict
             else:
-                # For all other fields, include only if the value is not None
-                if field_value is not None:
-                    node_dict[field_name] = field_value
-        
-        return node_dict
\ No newline at end of file
+                children_dict[key] = child # Non-SignalNode values pass through unchanged
+    return node_dict
+
+
+SignalNode.to_dict = _to_dict
+SignalNode.to_dict.__qualname__ = "SignalNode.to_dict"
+SignalNode.to_dict_self_only = _build_field_writer(SignalNode, include_children=False)
+SignalNode.to_dict_self_only.__qualname__ = "SignalNode.to_dict_self_only"
+SignalNode.to_dict_self_only.__doc__ = """
+        Converts only this SignalNode into a dictionary representation,
+        omitting entries where the value is None and never descending
+        into 'children'. Used for flat exports of data-carrying nodes.
+        """
@@ -4,8 +4,192 @@ import yaml
 import re
 import os
 import json
+import functools
+import logging
+from sys import intern
 from typing import Dict, Optional, Any, List, Union, Tuple, Iterator, Set
+from yaml.events import (AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+                         SequenceEndEvent, SequenceStartEvent, StreamEndEvent)
+from yaml.nodes import ScalarNode
 from vss_parsing_engine.models.signal import SignalNode
+from vss_parsing_engine.models.constants import VSS_LEAF_NODE_TYPES
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # LibYAML bindings, much faster
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# Instance range definitions such as "Row[1,2]"
+_INSTANCE_RANGE_RE = re.compile(r'^(\w+)\[(\d+),(\d+)\]$')
+# "#include <file> [target.branch]" directives
+_INCLUDE_RE = re.compile(r"#include\s+([^\s]+)\s*(.*)")
+# VSS node attributes mapped to the SignalNode fields they populate. These keys
+# (plus 'type') are never child nodes; any other dict-valued key of a node is.
+_VSS_ATTRIBUTE_FIELDS = {
+    'description': 'description',
+    'datatype': 'datatype',
+    'unit': 'unit',
+    'min': 'vss_min',
+    'max': 'vss_max',
+    'default': 'vss_default',
+    'allowed': 'vss_allowed_values',
+    'pattern': 'vss_pattern',
+    'deprecation': 'vss_deprecation',
+    'instances': 'vss_instances',
+}
+
+
+def _normalize_include_path(path: str) -> str:
+    """Normalizes an include path so './A/B.vspec', 'A\\B.vspec' and 'A/B.vspec' resolve alike."""
+    return os.path.normpath(path.replace('\\', '/')).replace('\\', '/')
+
+
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+_YAML_NON_SPECIFIC_TAGS = (None, '!')
+_YAML_CONTAINER_TYPES = (list, dict, set)
+# Implicit scalar types yaml.load always constructs successfully
+_YAML_SKIPPABLE_SCALAR_TAGS = frozenset('tag:yaml.org,2002:' + name for name in ('str', 'null', 'bool', 'int', 'float'))
+
+
+class _UnsupportedYamlFeature(Exception):
+    """Raised by the event loader for YAML it leaves to yaml.load (anchors, aliases, merge keys, tags)."""
+
+
+def _load_vss_yaml_events(vss_content: str) -> Any:
+    """
+    Builds the VSS structure straight from the YAML event stream instead of
+    composing and constructing the whole document first. Inside a node only
+    the VSS attributes, 'type' and mapping-valued (child node) keys are
+    constructed; any other value (uuid, comment, ...) is never built and is
+    kept as None so key order still matches yaml.load.
+    """
+    loader = YamlLoader(vss_content)
+    get_event = loader.get_event
+    resolve = loader.resolve
+    construct_object = loader.construct_object
+
+    def scalar(event: ScalarEvent) -> Any:
+        if event.anchor is not None:
+            raise _UnsupportedYamlFeature()
+        tag = event.tag
+        if tag in _YAML_NON_SPECIFIC_TAGS:
+            tag = resolve(ScalarNode, event.value, event.implicit)
+        if tag == _YAML_STR_TAG:
+            return event.value # The common case; no constructor round-trip needed
+        return construct_object(ScalarNode(tag, event.value, style=event.style))
+
+    def collection_start(event: Union[MappingStartEvent, SequenceStartEvent], default_tag: str):
+        if event.anchor is not None or event.tag not in _YAML_NON_SPECIFIC_TAGS and event.tag != default_tag:
+            raise _UnsupportedYamlFeature()
+
+    def value(event: Any, keep_all: bool) -> Any:
+        event_type = type(event)
+        if event_type is ScalarEvent:
+            return scalar(event)
+        if event_type is MappingStartEvent:
+            return mapping(event, keep_all)
+        if event_type is SequenceStartEvent:
+            collection_start(event, 'tag:yaml.org,2002:seq')
+            items = []
+            while True:
+                item_event = get_event()
+                if type(item_event) is SequenceEndEvent:
+                    return items
+                items.append(value(item_event, True))
+        raise _UnsupportedYamlFeature() # AliasEvent
+
+    def skip(event: Any):
+        # Consume an unused value without constructing it. Anything yaml.load could
+        # reject there (tags, complex keys, scalars other than plain types) is left to it.
+        open_collections = [] # Per open collection: events seen so far in a mapping, None for a sequence
+        while True:
+            event_type = type(event)
+            if event_type is MappingEndEvent or event_type is SequenceEndEvent:
+                open_collections.pop()
+            else:
+                if event_type is AliasEvent or event.anchor is not None or event.tag not in _YAML_NON_SPECIFIC_TAGS:
+                    raise _UnsupportedYamlFeature()
+                if open_collections and open_collections[-1] is not None:
+                    if open_collections[-1] % 2 == 0 and event_type is not ScalarEvent:
+                        raise _UnsupportedYamlFeature() # Complex key
+                    open_collections[-1] += 1
+                if event_type is ScalarEvent:
+                    if resolve(ScalarNode, event.value, event.implicit) not in _YAML_SKIPPABLE_SCALAR_TAGS:
+                        raise _UnsupportedYamlFeature() # e.g. timestamps, merge keys, '='
+                elif event_type is MappingStartEvent:
+                    open_collections.append(0)
+                else:
+                    open_collections.append(None)
+            if not open_collections:
+                return
+            event = get_event()
+
+    def mapping(event: MappingStartEvent, keep_all: bool, node_values: bool = False) -> Dict[Any, Any]:
+        # keep_all: build every value (attribute payloads). node_values: values are node definitions (top level).
+        collection_start(event, 'tag:yaml.org,2002:map')
+        result = {}
+        while True:
+            key_event = get_event()
+            if type(key_event) is MappingEndEvent:
+                return result
+            if type(key_event) is not ScalarEvent:
+                raise _UnsupportedYamlFeature() # Complex keys
+            if key_event.value == '<<' and key_event.tag is None:
+                raise _UnsupportedYamlFeature() # Merge key
+            key = scalar(key_event)
+            value_event = get_event()
+            if keep_all or key in _VSS_ATTRIBUTE_FIELDS or key == 'type':
+                result[key] = value(value_event, True)
+            elif node_values or type(value_event) is MappingStartEvent:
+                result[key] = value(value_event, False)
+            else:
+                skip(value_event)
+                result[key] = None
+
+    try:
+        get_event() # StreamStartEvent
+        if type(get_event()) is StreamEndEvent: # Empty stream
+            return None
+        event = get_event()
+        if type(event) is MappingStartEvent:
+            result = mapping(event, False, node_values=True)
+        else:
+            result = value(event, True)
+        get_event() # DocumentEndEvent
+        if type(get_event()) is not StreamEndEvent:
+            raise _UnsupportedYamlFeature() # Multiple documents; let yaml.load report it
+        return result
+    finally:
+        loader.dispose()
+
+
+@functools.lru_cache(maxsize=64)
+def _load_yaml_cached(vss_content: str) -> Any:
+    """
+    Parses a VSS YAML string, reusing the result when identical content is
+    parsed again (e.g. the same file included from several branches).
+    The returned structure is shared between callers and must not be mutated;
+    values handed to SignalNodes are copied with _copy_yaml_value first.
+    """
+    try:
+        return _load_vss_yaml_events(vss_content)
+    except _UnsupportedYamlFeature:
+        return yaml.load(vss_content, Loader=YamlLoader)
+
+
+def _copy_yaml_value(value: Any) -> Any:
+    """Returns a copy of a parsed YAML value that shares no list, dict or set with it."""
+    value_type = type(value)
+    if value_type is list:
+        return [_copy_yaml_value(item) for item in value]
+    if value_type is dict:
+        return {key: _copy_yaml_value(item) for key, item in value.items()}
+    if value_type is set:
+        return set(value) # Set items are hashable, hence immutable scalars
+    return value # Scalars are immutable
+
 
 class VSSParser:
     """
@@ -24,18 +208,31 @@ class VSSParser:
             mapping_file_path: Optional path to vendor mapping file for custom AOSP ID mapping
         """
         self.file_resolver = file_resolver if file_resolver is not None else {}
+        # Resolver index keyed by normalized path, tolerant of './' prefixes and '\\' separators
+        self._normalized_resolver: Dict[str, str] = {
+            _normalize_include_path(path): content for path, content in self.file_resolver.items()
+        }
+        # (normalized include path, base path) -> (top-level nodes, all nodes registered by that include)
+        self._include_parse_cache: Dict[Tuple[str, str], Tuple[Dict[str, SignalNode], Dict[str, SignalNode]]] = {}
         self._parsed_file_stack: List[str] = []  # To detect and prevent circular includes
         self._all_nodes_in_hierarchy: Dict[str, SignalNode] = {} # Stores all nodes by their full path
+        self.leaf_paths: List[str] = [] # Paths of the data-carrying (non-branch) nodes after the last load
         self.mapping_file_path = mapping_file_path
-        self.vendor_mapping: Dict[str, Any] = self._load_mapping_file() if mapping_file_path else {}
-        self._aosp_id_counter = 0x0100  # Starting AOSP ID for custom properties
+
+    @functools.cached_property
+    def vendor_mapping(self) -> Dict[str, Any]:
+        """
+        Vendor mapping for custom AOSP ID mapping, loaded from mapping_file_path
+        on first access so parsers that never consult it skip the file I/O.
+        """
+        return self._load_mapping_file() if self.mapping_file_path else {}
 
     def _load_mapping_file(self) -> Dict[str, Any]:
         """
         Loads the vendor mapping file if provided, to customize AOSP ID mapping.
         """
-        if not self.mapping_file_path or not os.path.exists(self.mapping_file_path):
-            print("No valid mapping file path provided or file does not exist.")
+        if not os.path.exists(self.mapping_file_path):
+            print(f"Warning: Mapping file '{self.mapping_file_path}' does not exist.")
             return {}
 
         try:
@@ -47,17 +244,6 @@ class VSSParser:
             print(f"Error loading mapping file: {e}")
             return {}
 
-    def _generate_aosp_id(self, signal_path: str) -> int:
-        """
-        Generates a unique AOSP ID for a given signal.
-        Uses vendor mapping if available, otherwise assigns a new ID.
-        """
-        if signal_path in self.vendor_mapping:
-            return self.vendor_mapping[signal_path].get('aosp_id', self._aosp_id_counter)
-        else:
-            self._aosp_id_counter += 1
-            return self._aosp_id_counter
-
     def _generate_instance_paths(self, base_name: str, instances_def: List[Union[str, List[str]]]) -> Iterator[Tuple[str, str]]:
         """
         Generates all possible full paths and names by expanding 'instances' definitions.
@@ -68,166 +254,153 @@ class VSSParser:
         Yields tuples of (instance_name_segment, instance_path_segment).
         """
 
-        current_combinations = [([], [])]
-
+        # Resolve every instance level into its (name_segment, path_segment) pairs
+        levels: List[List[Tuple[str, str]]] = []
         for instance_item in instances_def:
-            next_combinations = []
-            if isinstance(instance_item, str): # Simple name or range like "Row[1,2]"
-                range_match = re.match(r'^(\w+)\[(\d+),(\d+)\]$', instance_item)
-                if range_match: # Range-based like "Row[1,2]"
-                    prefix = range_match.group(1)
-                    start, end = int(range_match.group(2)), int(range_match.group(3))
-                    instance_segments = [f"{prefix}{i}" for i in range(start, end + 1)]
-                else: # Simple name like "Left"
-                    instance_segments = [instance_item]
-                
-                for segment in instance_segments:
-                    for prev_names, prev_paths in current_combinations:
-                        next_combinations.append((prev_names + [segment], prev_paths + [segment]))
-
-            elif isinstance(instance_item, list): # Nested instances, e.g., ["Row[1,2]", ["Left", "Right"]]
-                outer_segments: List[str] = []
-                outer_item = instance_item[0]
-                range_match = re.match(r'^(\w+)\[(\d+),(\d+)\]$', outer_item)
-                if range_match:
-                    prefix = range_match.group(1)
-                    start, end = int(range_match.group(2)), int(range_match.group(3))
-                    outer_segments = [f"{prefix}{i}" for i in range(start, end + 1)]
-                else:
-                    outer_segments = [outer_item]
-
-                inner_segments: List[str] = []
-                if len(instance_item) > 1 and isinstance(instance_item[1], list):
-                    for sub_item in instance_item[1]:
-                        sub_range_match = re.match(r'^(\w+)\[(\d+),(\d+)\]$', sub_item)
-                        if sub_range_match:
-                            sub_prefix = sub_range_match.group(1)
-                            sub_start, sub_end = int(sub_range_match.group(2)), int(sub_range_match.group(3))
-                            inner_segments.extend([f"{sub_prefix}{i}" for i in range(sub_start, sub_end + 1)])
-                        else:
-                            inner_segments.append(sub_item)
-                elif len(instance_item) > 1 and isinstance(instance_item[1], str):
-                    inner_segments.append(instance_item[1])
+            if type(instance_item) is str: # Simple name or range like "Row[1,2]"
+                levels.append([(segment, segment) for segment in self._expand_instance_range(instance_item)])
+
+            elif type(instance_item) is list: # Nested instances, e.g., ["Row[1,2]", ["Left", "Right"]]
+                outer_segments = self._expand_instance_range(instance_item[0])
+
+                if len(instance_item) > 1 and type(instance_item[1]) is list:
+                    inner_segments = [segment for sub_item in instance_item[1]
+                                      for segment in self._expand_instance_range(sub_item)]
+                elif len(instance_item) > 1 and type(instance_item[1]) is str:
+                    inner_segments = [instance_item[1]]
                 else:
                     inner_segments = [""] # Default for no specific inner segments
 
-                for outer_seg in outer_segments:
-                    for inner_seg in inner_segments:
-                        combined_name = f"{outer_seg}_{inner_seg}" if inner_seg else outer_seg
-                        combined_path = f"{outer_seg}.{inner_seg}" if inner_seg else outer_seg
-                        for prev_names, prev_paths in current_combinations:
-                            next_combinations.append((prev_names + [combined_name], prev_paths + [combined_path]))
-            
-            current_combinations = next_combinations
-
-        for name_parts, path_parts in current_combinations:
-            full_instance_name_segment = "_".join(filter(None, name_parts))
-            full_instance_path_segment = ".".join(filter(None, path_parts))
-            if not full_instance_name_segment and not full_instance_path_segment:
-                yield "", ""
+                levels.append([
+                    (f"{outer_seg}_{inner_seg}", f"{outer_seg}.{inner_seg}") if inner_seg else (outer_seg, outer_seg)
+                    for outer_seg in outer_segments
+                    for inner_seg in inner_segments
+                ])
             else:
-                yield full_instance_name_segment, full_instance_path_segment
-
-
-    def _parse_vss_attributes(self, details: Dict[str, Any]) -> Dict[str, Any]:
+                levels.append([]) # Unsupported definition: expands to nothing
+
+        # Fold the levels from the last (slowest varying) to the first (fastest), prefixing
+        # each level's segments. A segment's name is empty exactly when its path is (e.g.
+        # an "" instance), and such a segment contributes nothing to the combination.
+        combinations: List[Tuple[str, str]] = [("", "")]
+        for level in reversed(levels):
+            combinations = [
+                (f"{name}_{combined_name}" if combined_name else name,
+                 f"{path}.{combined_path}" if combined_path else path) if name else (combined_name, combined_path)
+                for combined_name, combined_path in combinations
+                for name, path in level
+            ]
+        yield from combinations
+
+    def _expand_instance_range(self, instance_item: str) -> List[str]:
         """
-        Extracts VSS-specific attributes from a node's details dictionary
-        and returns them in a format ready for SignalNode constructor.
+        Expands a range-based instance like "Row[1,2]" into ["Row1", "Row2"];
+        any other name is returned as a single segment.
         """
-        parsed_attrs = {}
-        parsed_attrs['vss_min'] = details.get('min')
-        parsed_attrs['vss_max'] = details.get('max')
-        parsed_attrs['vss_default'] = details.get('default')
-        parsed_attrs['vss_allowed_values'] = details.get('allowed')
-        parsed_attrs['vss_pattern'] = details.get('pattern')
-        parsed_attrs['vss_deprecation'] = details.get('deprecation')
-        parsed_attrs['vss_instances'] = details.get('instances')
-        return parsed_attrs
+        range_match = _INSTANCE_RANGE_RE.match(instance_item)
+        if not range_match:
+            return [instance_item]
+        prefix = range_match.group(1)
+        start, end = int(range_match.group(2)), int(range_match.group(3))
+        return [f"{prefix}{i}" for i in range(start, end + 1)]
+
 
     def _parse_node_data(self, node_key: str, node_details: Dict[str, Any], parent_path: str = "") -> List[SignalNode]:
         """
         Parses a single VSS node definition. If the node is a 'branch' with 'instances',
         it expands these instances into multiple SignalNode objects for the branch itself,
-        and recursively processes their children under the correct instantiated paths.
+        and processes their children under the correct instantiated paths.
         Returns a list of SignalNode objects generated from this node definition.
-        """
-        vss_attrs = self._parse_vss_attributes(node_details)
-        
-        # --- CRITICAL FIX: Determine node_type more robustly and handle child parsing ---
-        node_type = node_details.get("type")
-        if node_type is None:
-            # Check if it has signal-specific attributes (indicating it's a leaf)
-            if 'datatype' in node_details and node_key not in ["min", "max", "allowed", "pattern"]:
-                node_type = "signal"
-            else:
-                node_type = "branch" # Consider it as a branch if no datatype or only has aggregator attributes
-        # --- END CRITICAL FIX ---
 
+        The subtree is walked with an explicit stack instead of recursion. Entries are
+        (node_key, node_details, parent_path, parent_node, instance_path_segment, scanned),
+        where 'scanned' caches the node's (node_type, SignalNode kwargs, names of kwargs
+        holding lists/dicts/sets, child items) so expanded instances don't rescan their
+        definition. node_details may be a cached, shared parse result, so every node gets
+        its own copy of those container values. Children are pushed in reverse
+        so nodes are visited (and registered) in file order, depth-first.
+        """
         generated_nodes: List[SignalNode] = []
-
-        if node_type == "branch" and vss_attrs.get('vss_instances'):
-            instances_def = vss_attrs['vss_instances']
-            
-            for instance_name_suffix, instance_path_segment in self._generate_instance_paths(node_key, instances_def):
-                current_node_name = node_key
-                instantiated_full_path = f"{parent_path}.{instance_path_segment}" if parent_path else instance_path_segment
-
-                instance_node = SignalNode(
-                    name=current_node_name,
-                    path=instantiated_full_path,
-                    node_type="branch", # Instances are typically for branches
-                    description=node_details.get("description"),
-                    datatype=node_details.get("datatype"), # Will be None for branches
-                    unit=node_details.get("unit"), # Will be None for branches
-                    **vss_attrs
-                )
-                generated_nodes.append(instance_node)
-                
-                if instance_node.path in self._all_nodes_in_hierarchy:
-                    print(f"Info: Overwriting existing node definition for path: {instance_node.path} (likely from instance expansion).")
-                self._all_nodes_in_hierarchy[instance_node.path] = instance_node
-
-                for child_key_inner, child_value_inner in node_details.items():
-                    # Only recurse into children that are actual node definitions (dictionaries)
-                    # and are not VSS attributes we've already parsed.
-                    if isinstance(child_value_inner, dict) and \
-                       child_key_inner not in ['type', 'datatype', 'unit', 'description', 'min', 'max', 'default', 'allowed', 'pattern', 'deprecation', 'instances']:
-                        
-                        child_signal_nodes = self._parse_node_data(child_key_inner, child_value_inner, parent_path=instantiated_full_path)
-                        for c_node in child_signal_nodes:
-                            instance_node.children[c_node.name] = c_node
-                            if c_node.path in self._all_nodes_in_hierarchy:
-                                print(f"Info: Overwriting existing node definition for path: {c_node.path}")
-                            self._all_nodes_in_hierarchy[c_node.path] = c_node
-
-        else: # This is a non-instanced node (a signal, attribute, sensor, actuator, or a simple branch)
-            current_full_path = f"{parent_path}.{node_key}" if parent_path else node_key
+        stack: List[Tuple[str, Dict[str, Any], str, Optional[SignalNode], Optional[str], Optional[tuple]]] = [
+            (node_key, node_details, parent_path, None, None, None)
+        ]
+        attribute_fields = _VSS_ATTRIBUTE_FIELDS
+        # Nodes of this subtree by path, merged into _all_nodes_in_hierarchy in one update at the end
+        registered_nodes: Dict[str, SignalNode] = {}
+        log_overwrites = logger.isEnabledFor(logging.DEBUG)
+
+        while stack:
+            node_key, node_details, parent_path, parent_node, instance_path_segment, scanned = stack.pop()
+            if type(node_key) is str:
+                node_key = intern(node_key) # Names like "Door"/"Row1" repeat across the tree
+
+            if scanned is None:
+                # Single pass over the node: collect VSS attributes and child node definitions
+                node_type = None
+                node_kwargs: Dict[str, Any] = {}
+                container_fields: List[str] = []
+                child_items: List[Tuple[str, Dict[str, Any]]] = []
+                for key, value in node_details.items():
+                    field_name = attribute_fields.get(key)
+                    if field_name is not None:
+                        node_kwargs[field_name] = value
+                        if type(value) in _YAML_CONTAINER_TYPES:
+                            container_fields.append(field_name)
+                    elif key == "type":
+                        node_type = value
+                    elif type(value) is dict:
+                        # Only descend into children that are actual node definitions
+                        # (the YAML safe loaders only produce plain dicts, never subclasses)
+                        child_items.append((key, value))
+
+                # --- CRITICAL FIX: Determine node_type more robustly and handle child parsing ---
+                if node_type is None:
+                    # Check if it has signal-specific attributes (indicating it's a leaf)
+                    if 'datatype' in node_kwargs and node_key not in ["min", "max", "allowed", "pattern"]:
+                        node_type = "signal"
+                    else:
+                        node_type = "branch" # Consider it as a branch if no datatype or only has aggregator attributes
+                # --- END CRITICAL FIX ---
+                scanned = (node_type, node_kwargs, container_fields, child_items)
+
+                if node_type == "branch" and node_kwargs.get('vss_instances'):
+                    # Replace this entry with one entry per expanded instance, keeping instance order
+                    instance_entries = [
+                        (node_key, node_details, parent_path, parent_node, path_segment, scanned)
+                        for _, path_segment in self._generate_instance_paths(node_key, node_kwargs['vss_instances'])
+                    ]
+                    stack.extend(reversed(instance_entries))
+                    continue
+            else:
+                node_type, node_kwargs, container_fields, child_items = scanned
+
+            if instance_path_segment is not None: # One expanded instance of an instanced branch
+                current_full_path = intern(f"{parent_path}.{instance_path_segment}" if parent_path else instance_path_segment)
+                overwrite_note = " (likely from instance expansion)."
+            else: # A signal, attribute, sensor, actuator, or a simple branch
+                current_full_path = intern(f"{parent_path}.{node_key}") if parent_path else node_key
+                overwrite_note = "."
+
+            if container_fields:
+                node_kwargs = dict(node_kwargs)
+                for field_name in container_fields:
+                    node_kwargs[field_name] = _copy_yaml_value(node_kwargs[field_name])
+            node = SignalNode(name=node_key, path=current_full_path, node_type=node_type, **node_kwargs)
+            if parent_node is None:
+                generated_nodes.append(node)
+            else:
+                parent_node.children[node.name] = node
             
-            main_node = SignalNode(
-                name=node_key,
-                path=current_full_path,
-                node_type=node_type,
-                description=node_details.get("description"),
-                datatype=node_details.get("datatype"),
-                unit=node_details.get("unit"),
-                **vss_attrs
+            if log_overwrites and (current_full_path in registered_nodes or current_full_path in self._all_nodes_in_hierarchy):
+                logger.debug("Overwriting existing node definition for path: %s%s", current_full_path, overwrite_note)
+            registered_nodes[current_full_path] = node
+
+            stack.extend(
+                (child_key, child_value, current_full_path, node, None, None)
+                for child_key, child_value in reversed(child_items)
             )
-            generated_nodes.append(main_node)
-            
-            if main_node.path in self._all_nodes_in_hierarchy:
-                print(f"Info: Overwriting existing node definition for path: {main_node.path}.")
-            self._all_nodes_in_hierarchy[main_node.path] = main_node
-
-            for child_key_inner, child_value_inner in node_details.items():
-                # Only recurse into children that are actual node definitions (dictionaries)
-                # and are not VSS attributes we've already parsed.
-                if isinstance(child_value_inner, dict) and \
-                   child_key_inner not in ['type', 'datatype', 'unit', 'description', 'min', 'max', 'default', 'allowed', 'pattern', 'deprecation', 'instances']:
-                    
-                    child_signal_nodes = self._parse_node_data(child_key_inner, child_value_inner, parent_path=current_full_path)
-                    for c_node in child_signal_nodes:
-                        main_node.children[c_node.name] = c_node
         
+        self._all_nodes_in_hierarchy.update(registered_nodes)
         return generated_nodes
 
 
@@ -236,7 +409,7 @@ class VSSParser:
         Processes an '#include' directive. Fetches content and recursively parses it.
         The parsed nodes from the included file are then added to the global hierarchy map.
         """
-        include_match = re.match(r"#include\s+([^\s]+)\s*(.*)", include_line)
+        include_match = _INCLUDE_RE.match(include_line)
         if not include_match:
             print(f"Warning: Malformed include directive: '{include_line}' in node '{current_node.path}'")
             return
@@ -246,26 +419,45 @@ class VSSParser:
 
         effective_base_path_for_included_content = target_branch_path_in_directive if target_branch_path_in_directive else current_node.path
 
-        if included_file_path_key in self.file_resolver:
-            if included_file_path_key in self._parsed_file_stack:
+        normalized_key = _normalize_include_path(included_file_path_key)
+        if normalized_key in self._normalized_resolver:
+            if normalized_key in self._parsed_file_stack:
                 print(f"Warning: Circular include detected: '{included_file_path_key}'. Skipping.")
                 return
 
-            self._parsed_file_stack.append(included_file_path_key)
-            included_content = self.file_resolver[included_file_path_key]
-            
-            print(f"  Including: '{included_file_path_key}' under target branch '{effective_base_path_for_included_content}'")
-
-            parsed_top_level_from_include = self._parse_vss_content_internal(
-                included_content,
-                base_path=effective_base_path_for_included_content
-            )
+            cache_key = (normalized_key, effective_base_path_for_included_content)
+            cached = self._include_parse_cache.get(cache_key)
+            if cached is None:
+                self._parsed_file_stack.append(normalized_key)
+                included_content = self._normalized_resolver[normalized_key]
+                
+                logger.debug("Including: '%s' under target branch '%s'", included_file_path_key, effective_base_path_for_included_content)
+
+                # Collect the include's nodes separately so a repeated include can re-register them
+                outer_nodes = self._all_nodes_in_hierarchy
+                self._all_nodes_in_hierarchy = {}
+                try:
+                    parsed_top_level_from_include = self._parse_vss_content_internal(
+                        included_content,
+                        base_path=effective_base_path_for_included_content
+                    )
+                    included_nodes = self._all_nodes_in_hierarchy
+                finally:
+                    self._all_nodes_in_hierarchy = outer_nodes
+                    self._parsed_file_stack.pop()
+                cached = (parsed_top_level_from_include, included_nodes)
+                self._include_parse_cache[cache_key] = cached
+
+            parsed_top_level_from_include, included_nodes = cached
+            if logger.isEnabledFor(logging.DEBUG):
+                for path in included_nodes:
+                    if path in self._all_nodes_in_hierarchy:
+                        logger.debug("Overwriting existing node definition for path: %s.", path)
+            self._all_nodes_in_hierarchy.update(included_nodes)
 
             if not target_branch_path_in_directive:
                  for node_name, node_obj in parsed_top_level_from_include.items():
                     current_node.children[node_name] = node_obj
-
-            self._parsed_file_stack.pop()
         else:
             print(f"Warning: Included file content for '{included_file_path_key}' not found in resolver (referenced by '{current_node.path}'). Skipping include.")
 
@@ -276,7 +468,7 @@ class VSSParser:
         This method is recursive and populates `self._all_nodes_in_hierarchy`.
         """
         try:
-            parsed_yaml = yaml.safe_load(vss_content)
+            parsed_yaml = _load_yaml_cached(vss_content)
         except yaml.YAMLError as e:
             print(f"Error parsing VSS YAML content for base path '{base_path}': {e}")
             return {}
@@ -321,17 +513,22 @@ class VSSParser:
         
         self._parsed_file_stack = []
         self._all_nodes_in_hierarchy = {}
+        self._include_parse_cache = {}
 
         if root_vss_path_key not in self.file_resolver:
             raise FileNotFoundError(f"Root VSS file '{root_vss_path_key}' not found in file resolver. "
                                     "Ensure it's provided in the VSSParser's file_resolver dictionary in main.py.")
 
         root_content = self.file_resolver[root_vss_path_key]
-        self._parsed_file_stack.append(root_vss_path_key)
+        self._parsed_file_stack.append(_normalize_include_path(root_vss_path_key))
         
         self._parse_vss_content_internal(root_content, base_path="")
         
         self._parsed_file_stack.pop()
 
+        # Let consumers such as the enricher skip branch nodes without re-filtering
+        self.leaf_paths = [path for path, node in self._all_nodes_in_hierarchy.items()
+                           if node.node_type in VSS_LEAF_NODE_TYPES]
+
         print(f"Finished VSS parsing. Found {len(self._all_nodes_in_hierarchy)} unique nodes (including branches and instances).")
         return self._all_nodes_in_hierarchy
\ No newline at end of file
@@ -1,13 +1,61 @@
 # File: src/vss_parsing_engine/processing/property_enricher.py
 # Applies rules to generate aospId, aospArea, vhal_type, etc.
 import re
-from typing import Dict, Any, Optional, List, Union
+import logging
+import hashlib
+import os
+import yaml
+from collections import Counter
+from dataclasses import fields
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Union, Tuple, NamedTuple
+try:
+    from yaml import CSafeLoader as YamlLoader  # LibYAML bindings, much faster
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 # Corrected relative imports for your project structure
 from ..models.signal import SignalNode
-from ..models.constants import VhalPropertyType, VhalAreaType, VhalAccessMode, VhalChangeMode, VhalPropertyGroup
+from ..models.constants import (VhalPropertyType, VhalAreaType, VhalAccessMode, VhalChangeMode, VhalPropertyGroup,
+                                VSS_LEAF_NODE_TYPES)
 # Base ID for VENDOR properties to ensure they fall within the correct range.
 VHAL_VENDOR_PROPERTY_ID_MASK = 0x20000000
 
+logger = logging.getLogger(__name__)
+
+# 'vhal' values in typemap.yml and the VHAL types they select; any other value maps to MIXED
+_TYPEMAP_VHAL_TYPES = {
+    'int32': VhalPropertyType.INT32,
+    'int64': VhalPropertyType.INT64,
+    'float': VhalPropertyType.FLOAT,
+    'string': VhalPropertyType.STRING,
+    'int32[]': VhalPropertyType.INT32_VEC,
+    'float[]': VhalPropertyType.FLOAT_VEC,
+}
+
+# VHAL types whose default initial value is 0 / an empty list
+_INTEGER_VHAL_TYPES = frozenset({VhalPropertyType.INT32, VhalPropertyType.INT64})
+_VECTOR_VHAL_TYPES = frozenset({VhalPropertyType.INT32_VEC, VhalPropertyType.FLOAT_VEC})
+
+# Characters not allowed in VHAL ID names
+_ID_CLEAN_RE = re.compile(r'[^a-zA-Z0-9]+')
+
+# Heuristic patterns that are plain words, matchable without the regex engine
+_LITERAL_PATTERN_RE = re.compile(r'[A-Za-z0-9_]+')
+
+
+# Leaf signals each worker should get before enrichment is spread over processes;
+# below this, process start-up and pickling cost more than the enrichment itself.
+PARALLEL_ENRICH_MIN_SIGNALS_PER_WORKER = 25000
+
+
+class _CompiledRules(NamedTuple):
+    """A heuristic rule set prepared by PropertyEnricher._compile_rules."""
+    literal_rules: Optional[List[Tuple[Tuple[str, ...], Any]]]  # (lowercase words, result); None unless all patterns are words
+    fused: Optional[re.Pattern]  # All rules as one priority-ordered regex
+    results_by_group: Dict[str, Any]  # Result value per rule group name of 'fused'
+    compiled_rules: List[Tuple[List[re.Pattern], Any]]  # (compiled patterns, result) in priority order
+
+
 class PropertyEnricher:
     """
     Enriches SignalNode objects (parsed from VSS) with Android VHAL-like attributes
@@ -17,6 +65,25 @@ class PropertyEnricher:
     and property_heuristics.yml to perform the enrichment.
     """
 
+    # Direct mapping from (lowercase) VSS types to VHAL types
+    _VSS_TO_VHAL = {
+        'boolean': VhalPropertyType.BOOLEAN,
+        'uint8': VhalPropertyType.INT32,
+        'int8': VhalPropertyType.INT32,
+        'uint16': VhalPropertyType.INT32,
+        'int16': VhalPropertyType.INT32,
+        'uint32': VhalPropertyType.INT32,
+        'int32': VhalPropertyType.INT32,
+        'uint64': VhalPropertyType.INT64,
+        'int64': VhalPropertyType.INT64,
+        'float': VhalPropertyType.FLOAT,
+        'double': VhalPropertyType.FLOAT,
+        'string': VhalPropertyType.STRING,
+        'string[]': VhalPropertyType.STRING,  # Could also be MIXED if complex
+        'int32[]': VhalPropertyType.INT32_VEC,
+        'float[]': VhalPropertyType.FLOAT_VEC,
+    }
+
     def __init__(self, property_heuristics: Dict, typemap: Dict, unit_conversion_rules: Dict):
         """
         Initializes the PropertyEnricher with necessary configuration files.
@@ -28,217 +95,326 @@ class PropertyEnricher:
         self.property_heuristics = property_heuristics
         self.typemap = typemap
         self.unit_conversion_rules = unit_conversion_rules
+        # typemap.yml entries with a 'vhal' type, resolved to VHAL types up front
+        self._typemap_vhal_types: Dict[str, str] = {
+            type_name: _TYPEMAP_VHAL_TYPES.get(type_config['vhal'], VhalPropertyType.MIXED)
+                       if type(type_config['vhal']) is str else VhalPropertyType.MIXED
+            for type_name, type_config in typemap.items()
+            if isinstance(type_config, dict) and 'vhal' in type_config
+        }
+        # typemap.yml 'default_value' entries, keyed exactly as in the typemap
+        self._typemap_default_values: Dict[str, Any] = {
+            type_name: type_config['default_value']
+            for type_name, type_config in typemap.items()
+            if isinstance(type_config, dict) and 'default_value' in type_config
+        }
+        # Signals seen per unknown VSS datatype, reported once at the end of enrich_signals
+        self._unknown_type_counts: Counter = Counter()
+        # VSS datatype -> (VHAL type, known datatype), filled by _map_vhal_type
+        self._vhal_type_cache: Dict[str, Tuple[str, bool]] = {}
+        # Heuristic rules, sorted by priority with their patterns compiled (and fused) once
+        self._area_rules = self._compile_rules(property_heuristics['area_type_rules'], 'vhal_area')
+        self._access_rules = self._compile_rules(property_heuristics['access_mode_rules'], 'vhal_access')
+        self._change_rules = self._compile_rules(property_heuristics['change_mode_rules'], 'vhal_change_mode')
+
+    @staticmethod
+    def _compile_rules(rules: List[Dict[str, Any]], result_key: str) -> _CompiledRules:
+        """
+        Sorts heuristic rules by priority (keeping file order for ties) and compiles
+        their patterns into (compiled_patterns, result_value) pairs.
+
+        The rules are also fused into one regex, '(?P<r0>(?=.*?(?:p0a|p0b)))|(?P<r1>...)',
+        matched at the start of the string: alternatives are tried in priority order and
+        each lookahead searches the whole string, so the first rule with any matching
+        pattern wins, exactly as with per-pattern searches. The fused regex is None
+        when a pattern can't be fused (e.g. it has its own groups).
+
+        When every pattern is a plain word (or the '.*' catch-all) the rules are
+        additionally kept as lowercase literals, so ASCII targets are classified with
+        substring tests instead of a case-insensitive regex scan.
+        """
+        compiled_rules = [
+            ([re.compile(pattern, re.IGNORECASE) for pattern in rule.get("patterns", [])], rule.get(result_key))
+            for rule in sorted(rules, key=lambda x: x.get('priority', 999))
+        ]
+
+        literal_rules = []
+        for patterns, result in compiled_rules:
+            literals = []
+            for pattern in patterns:
+                if pattern.pattern == ".*":
+                    literals.append("") # Matches every string, as does '' in target
+                elif _LITERAL_PATTERN_RE.fullmatch(pattern.pattern):
+                    literals.append(pattern.pattern.lower())
+                else:
+                    literal_rules = None
+                    break
+            if literal_rules is None:
+                break
+            literal_rules.append((tuple(literals), result))
+
+        alternatives = []
+        results_by_group = {}
+        for index, (patterns, result) in enumerate(compiled_rules):
+            if any(pattern.groups for pattern in patterns):
+                return _CompiledRules(literal_rules, None, {}, compiled_rules) # Groups/backreferences would be renumbered
+            if patterns: # A rule without patterns never matches
+                group_name = f"r{index}"
+                alternatives.append(f"(?P<{group_name}>(?=(?s:.*?)(?:{'|'.join(p.pattern for p in patterns)})))")
+                results_by_group[group_name] = result
+        try:
+            fused = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        except re.error:
+            fused = None
+        return _CompiledRules(literal_rules, fused, results_by_group, compiled_rules)
 
     def _load_config(self, filepath: str, optional: bool = False) -> Dict[str, Any]:
         """Helper method to load a YAML configuration file."""
         try:
             with open(filepath, 'r') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=YamlLoader) or {}
         except FileNotFoundError:
             if optional:
                 return {}
             raise
 
-    def enrich_signals(self, vss_signals: Dict[str, SignalNode]) -> Dict[str, SignalNode]:
+    def enrich_signals(self, vss_signals: Dict[str, SignalNode], leaf_paths: Optional[List[str]] = None) -> Dict[str, SignalNode]:
         """
         Iterates through all parsed VSS SignalNode objects and enriches them
         with inferred VHAL-like attributes.
         Args:
             vss_signals (Dict[str, SignalNode]): A dictionary of SignalNode objects,
                 keyed by their full VSS path.
+            leaf_paths (List[str], optional): Paths of the data-carrying nodes in
+                vss_signals (VSSParser.leaf_paths); when given, branch nodes are
+                not visited at all.
         Returns:
             Dict[str, SignalNode]: The same dictionary of SignalNode objects,
             with VHAL-specific attributes populated for 'signal', 'sensor', 'actuator',
             and 'attribute' type nodes.
         """
         print("Starting VHAL property enrichment...")
-        enriched_signals_count = 0
-        for path, signal_node in vss_signals.items():
-            if signal_node.node_type in ["signal", "sensor", "actuator", "attribute"]:
+        self._unknown_type_counts.clear()
+        leaf_signals: List[SignalNode] = []
+        skipped_containers = 0
+        skipped_incomplete = 0
+        if leaf_paths is None:
+            signal_items = vss_signals.items()
+        else:
+            signal_items = ((path, vss_signals[path]) for path in leaf_paths)
+        for path, signal_node in signal_items:
+            if signal_node.node_type in VSS_LEAF_NODE_TYPES:
                 # Additional validation to ensure we only process true leaf nodes with data
-                if (hasattr(signal_node, 'datatype') and signal_node.datatype and 
-                    hasattr(signal_node, 'description') and signal_node.description and
-                    signal_node.description.strip() and
+                # (SignalNode always defines these fields, so no hasattr probing is needed)
+                if (signal_node.datatype and
+                    signal_node.description and signal_node.description.strip() and
                     # Ensure it's not a message container by checking if it has children
-                    (not hasattr(signal_node, 'children') or len(signal_node.children) == 0)):
-                    self._enrich_single_signal(signal_node)
-                    enriched_signals_count += 1
+                    not signal_node.children):
+                    leaf_signals.append(signal_node)
                 else:
                     # Skip nodes without datatype/description or with children (message containers)
-                    if hasattr(signal_node, 'children') and len(signal_node.children) > 0:
-                        print(f"Warning: Skipping signal '{path}' - appears to be a message container with {len(signal_node.children)} children")
+                    if signal_node.children:
+                        skipped_containers += 1
+                        logger.debug("Skipping signal '%s' - appears to be a message container with %d children",
+                                     path, len(signal_node.children))
                     else:
-                        print(f"Warning: Skipping signal '{path}' - missing datatype or description")
-        print(f"Finished enriching {enriched_signals_count} VSS signals.")
+                        skipped_incomplete += 1
+                        logger.debug("Skipping signal '%s' - missing datatype or description", path)
+        if skipped_containers or skipped_incomplete:
+            print(f"Warning: Skipped {skipped_containers + skipped_incomplete} signals "
+                  f"({skipped_containers} message containers, {skipped_incomplete} missing datatype or description)")
+
+        workers = min(os.cpu_count() or 1, len(leaf_signals) // PARALLEL_ENRICH_MIN_SIGNALS_PER_WORKER)
+        if workers > 1:
+            self._enrich_in_processes(leaf_signals, workers)
+        else:
+            for signal_node in leaf_signals:
+                self._enrich_single_signal(signal_node)
+        for vss_type, signal_count in self._unknown_type_counts.items():
+            print(f"Warning: Unknown VSS type '{vss_type}' for {signal_count} signals, defaulting to MIXED")
+        print(f"Finished enriching {len(leaf_signals)} VSS signals.")
         return vss_signals
 
+    def _enrich_in_processes(self, leaf_signals: List[SignalNode], workers: int):
+        """
+        Enriches leaf signals in a process pool. Each worker builds its own
+        PropertyEnricher once and returns the enriched attributes of every node
+        in its chunk, which are copied back onto the original SignalNodes.
+        """
+        chunk_size = -(-len(leaf_signals) // (workers * 4)) # A few chunks per worker to balance load
+        chunks = [leaf_signals[i:i + chunk_size] for i in range(0, len(leaf_signals), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_enrich_worker,
+                                 initargs=(self.property_heuristics, self.typemap, self.unit_conversion_rules)) as executor:
+            for chunk, (enriched_attributes, unknown_type_counts) in zip(chunks, executor.map(_enrich_chunk, chunks)):
+                self._unknown_type_counts.update(unknown_type_counts)
+                for signal_node, values in zip(chunk, enriched_attributes):
+                    for field_name, value in zip(_ENRICHED_NODE_FIELDS, values):
+                        setattr(signal_node, field_name, value)
+
     def _enrich_single_signal(self, signal_node: SignalNode):
         """
         Applies all enrichment rules to a single SignalNode.
         """
+        # Case-normalized forms shared by the steps below
+        path = signal_node.path
+        vss_type_lower = signal_node.datatype.lower() if signal_node.datatype else ""
+        path_upper = path.upper()
+        # For ASCII paths lower() of the uppercased path is just path.lower()
+        path_lower = path.lower() if path.isascii() else None
+        # The parser names nodes by their full path, so the lowercased path usually serves the name too
+        name_lower = path_lower if path_lower is not None and signal_node.name == path else signal_node.name.lower()
+
         # 1. vhal_type Mapping
-        self._map_vhal_type(signal_node)
+        self._map_vhal_type(signal_node, vss_type_lower)
 
         # 2. Heuristic-based inference
-        self._infer_access_mode(signal_node)
-        self._infer_change_mode(signal_node)
-        self._infer_aosp_area(signal_node)
-        self._set_min_max_values(signal_node)
+        self._infer_access_mode(signal_node, name_lower)
+        self._infer_change_mode(signal_node, name_lower)
+        self._infer_aosp_area(signal_node, path_upper, path_lower)
+        self._set_min_max_values(signal_node, vss_type_lower)
         self._apply_unit_conversion(signal_node)
             
         # 3. aospId Generation (must be done after other properties are set)
-        self._generate_aosp_id(signal_node)
+        self._generate_aosp_id(signal_node, path_upper)
 
 
-    def _generate_aosp_id(self, signal_node: SignalNode):
+    def _generate_aosp_id(self, signal_node: SignalNode, path_upper: Optional[str] = None):
         """
         Generates a unique and deterministic VHAL property ID.
         This ID is a bitwise combination of a base ID, a property group,
         a data type, and an area.
+        path_upper is the uppercased path, if the caller already has it.
         """
+        # One digest of the VSS path serves both the fallback name and the base ID
+        path_hash = hashlib.md5(signal_node.path.encode()).hexdigest()
+
         # Use a consistent naming convention for the VHAL ID.
-        vhal_id_name = re.sub(r'[^a-zA-Z0-9]+', '_', signal_node.path).upper()
-        
-        # Fix trailing underscores and multiple consecutive underscores
-        vhal_id_name = re.sub(r'_+', '_', vhal_id_name)  # Replace multiple underscores with single
-        vhal_id_name = vhal_id_name.strip('_')  # Remove leading/trailing underscores
+        # Each run of non-alphanumerics (underscores included) becomes a single '_',
+        # so only leading/trailing underscores are left to remove.
+        if path_upper is not None and signal_node.path.isascii():
+            # For ASCII paths cleaning commutes with upper(), so reuse the caller's uppercased path
+            vhal_id_name = _ID_CLEAN_RE.sub('_', path_upper).strip('_')
+        else:
+            vhal_id_name = _ID_CLEAN_RE.sub('_', signal_node.path).upper().strip('_')
         
         # Ensure the name is not empty and has a valid identifier
         if not vhal_id_name or not vhal_id_name.replace('_', '').isalnum():
             # Fallback to a hash-based name if cleaning results in invalid name
-            import hashlib
-            path_hash = hashlib.md5(signal_node.path.encode()).hexdigest()[:8]
-            vhal_id_name = f"VEHICLE_PROPERTY_{path_hash.upper()}"
+            vhal_id_name = f"VEHICLE_PROPERTY_{path_hash[:8].upper()}"
         
         signal_node.vhal_id = vhal_id_name
         
         # Generate a unique base ID for the property.
         # This is a critical part of the process, ensuring no collisions.
-        import hashlib
-        # The base ID is derived from a hash of the VSS path.
-        path_hash = hashlib.md5(signal_node.path.encode()).hexdigest()
+        # The base ID is derived from a hash of the VSS path; it is part of the
+        # generated property IDs, so the derivation must stay stable across releases.
         base_id = int(path_hash[:4], 16)
         signal_node.vhal_id_base = f"0x{base_id:04X}"
         # We assume properties are 'SYSTEM' for now, but a manual mapping
         # could set this to 'VENDOR'.
         signal_node.vhal_property_group = VhalPropertyGroup.SYSTEM
             
-    def _map_vhal_type(self, signal_node: SignalNode):
+    def _map_vhal_type(self, signal_node: SignalNode, vss_type_lower: Optional[str] = None):
         """
         Maps the VSS datatype to its corresponding VHAL type.
+        vss_type_lower is the lowercased datatype, if the caller already has it.
         """
         vss_type = signal_node.datatype
         if not vss_type:
             signal_node.vhal_type = VhalPropertyType.MIXED
             return
-        
-        # Direct mapping from VSS types to VHAL types
-        vss_to_vhal_mapping = {
-            'boolean': VhalPropertyType.BOOLEAN,
-            'uint8': VhalPropertyType.INT32,
-            'int8': VhalPropertyType.INT32,
-            'uint16': VhalPropertyType.INT32,
-            'int16': VhalPropertyType.INT32,
-            'uint32': VhalPropertyType.INT32,
-            'int32': VhalPropertyType.INT32,
-            'uint64': VhalPropertyType.INT64,
-            'int64': VhalPropertyType.INT64,
-            'float': VhalPropertyType.FLOAT,
-            'double': VhalPropertyType.FLOAT,
-            'string': VhalPropertyType.STRING,
-            'string[]': VhalPropertyType.STRING,  # Could also be MIXED if complex
-            'int32[]': VhalPropertyType.INT32_VEC,
-            'float[]': VhalPropertyType.FLOAT_VEC,
-        }
-        
+
+        # Many signals share a datatype, so each distinct one is resolved only once
+        resolved = self._vhal_type_cache.get(vss_type)
+        if resolved is None:
+            resolved = self._resolve_vhal_type(vss_type, vss_type_lower if vss_type_lower is not None else vss_type.lower())
+            self._vhal_type_cache[vss_type] = resolved
+        vhal_type, is_known_type = resolved
+
+        signal_node.vhal_type = vhal_type
+        if not is_known_type:
+            # Aggregated per datatype by enrich_signals instead of printing once per signal
+            self._unknown_type_counts[vss_type] += 1
+            logger.debug("Unknown VSS type '%s' for signal %s, defaulting to MIXED", vss_type, signal_node.path)
+
+    def _resolve_vhal_type(self, vss_type: str, vss_type_lower: str) -> Tuple[str, bool]:
+        """
+        Resolves a VSS datatype to (VHAL type, whether the datatype is known).
+        """
         # Use direct mapping first
-        vhal_type = vss_to_vhal_mapping.get(vss_type.lower())
+        vhal_type = self._VSS_TO_VHAL.get(vss_type_lower)
         if vhal_type:
-            signal_node.vhal_type = vhal_type
-            return
+            return vhal_type, True
         
         # Fallback to typemap.yml if direct mapping fails
-        vhal_type_map = self.typemap.get(vss_type.upper())
-        if vhal_type_map and 'vhal' in vhal_type_map:
-            vhal_str = vhal_type_map.get('vhal')
-            # Convert string representation to proper VHAL type
-            if vhal_str == 'int32':
-                signal_node.vhal_type = VhalPropertyType.INT32
-            elif vhal_str == 'int64':
-                signal_node.vhal_type = VhalPropertyType.INT64
-            elif vhal_str == 'float':
-                signal_node.vhal_type = VhalPropertyType.FLOAT
-            elif vhal_str == 'string':
-                signal_node.vhal_type = VhalPropertyType.STRING
-            elif vhal_str in ['string[]', 'int32[]', 'float[]']:
-                if 'int32' in vhal_str:
-                    signal_node.vhal_type = VhalPropertyType.INT32_VEC
-                elif 'float' in vhal_str:
-                    signal_node.vhal_type = VhalPropertyType.FLOAT_VEC
-                else:
-                    signal_node.vhal_type = VhalPropertyType.MIXED
-            else:
-                signal_node.vhal_type = VhalPropertyType.MIXED
-        else:
-            # Final fallback to MIXED for unknown types
-            signal_node.vhal_type = VhalPropertyType.MIXED
-            print(f"Warning: Unknown VSS type '{vss_type}' for signal {signal_node.path}, defaulting to MIXED")
+        vhal_type = self._typemap_vhal_types.get(vss_type.upper())
+        if vhal_type:
+            return vhal_type, True
+        # Final fallback to MIXED for unknown types
+        return VhalPropertyType.MIXED, False
 
 
-    def _infer_aosp_area(self, signal_node: SignalNode):
+    def _infer_aosp_area(self, signal_node: SignalNode, path_upper: Optional[str] = None,
+                         path_lower: Optional[str] = None):
         """
         Infers the VHAL area type based on keywords in the signal path.
+        path_upper and path_lower are the case-normalized path, if the caller already has them.
         """
-        path_upper = signal_node.path.upper()
-        inferred_area = self._apply_rule(
-            path_upper,
-            self.property_heuristics['area_type_rules'],
-            'vhal_area',
-            VhalAreaType.GLOBAL
-        )
+        if path_upper is None:
+            path_upper = signal_node.path.upper()
+            path_lower = None
+        inferred_area = self._apply_rule(path_upper, self._area_rules, VhalAreaType.GLOBAL, path_lower)
         signal_node.vhal_area = inferred_area
 
 
-    def _apply_rule(self, target_string: str, rules: List[Dict[str, Any]], result_key: str, default: str) -> str:
+    def _apply_rule(self, target_string: str, rules: _CompiledRules, default: str,
+                    target_lower: Optional[str] = None) -> str:
         """
-        Helper method to apply a list of heuristic rules against a target string.
+        Helper method to apply compiled heuristic rules (see _compile_rules)
+        against a target string.
+        target_lower is target_string.lower(), if the caller already has it.
         """
-        for rule in sorted(rules, key=lambda x: x.get('priority', 999)):
-            patterns = rule.get("patterns", [])
+        literal_rules, fused, results_by_group, compiled_rules = rules
+        if literal_rules is not None and type(target_string) is str and target_string.isascii():
+            # For ASCII text, IGNORECASE matching of a plain word is a lowercase substring test
+            lowered = target_string.lower() if target_lower is None else target_lower
+            for literals, result in literal_rules:
+                for literal in literals:
+                    if literal in lowered:
+                        return result
+            return default
+        if fused is not None:
+            match = fused.match(target_string)
+            return results_by_group[match.lastgroup] if match else default
+        for patterns, result in compiled_rules:
             for pattern in patterns:
-                if re.search(pattern, target_string, re.IGNORECASE):
-                    return rule.get(result_key)
+                if pattern.search(target_string):
+                    return result
         return default
 
-    def _infer_access_mode(self, signal_node: SignalNode):
+    def _infer_access_mode(self, signal_node: SignalNode, name_lower: Optional[str] = None):
         """
         Infers the VHAL access mode using heuristics.
+        name_lower is the lowercased node name, if the caller already has it.
         """
-        inferred_access = self._apply_rule(
-            signal_node.name,
-            self.property_heuristics["access_mode_rules"],
-            "vhal_access",
-            VhalAccessMode.READ
-        )
         # Prioritize VSS node type if it's more specific.
         if signal_node.node_type == 'sensor':
+            # Sensors are always read-only, so the heuristics need not run at all
             signal_node.vhal_access = VhalAccessMode.READ
-        elif signal_node.node_type == 'actuator':
+            return
+        inferred_access = self._apply_rule(signal_node.name, self._access_rules, VhalAccessMode.READ, name_lower)
+        if signal_node.node_type == 'actuator':
             signal_node.vhal_access = inferred_access if inferred_access else VhalAccessMode.READ_WRITE
         else:
             signal_node.vhal_access = inferred_access
 
 
-    def _infer_change_mode(self, signal_node: SignalNode):
+    def _infer_change_mode(self, signal_node: SignalNode, name_lower: Optional[str] = None):
         """
         Infers the VHAL change mode using heuristics.
+        name_lower is the lowercased node name, if the caller already has it.
         """
-        inferred_mode = self._apply_rule(
-            signal_node.name,
-            self.property_heuristics["change_mode_rules"],
-            "vhal_change_mode",
-            VhalChangeMode.ON_CHANGE
-        )
+        inferred_mode = self._apply_rule(signal_node.name, self._change_rules, VhalChangeMode.ON_CHANGE, name_lower)
         signal_node.vhal_change_mode = inferred_mode
 
     def _apply_unit_conversion(self, signal_node: SignalNode):
@@ -249,9 +425,10 @@ class PropertyEnricher:
         signal_node.unit_multiplier = 1.0
         signal_node.unit_offset = 0.0
 
-    def _set_min_max_values(self, signal_node: SignalNode):
+    def _set_min_max_values(self, signal_node: SignalNode, vss_type_lower: Optional[str] = None):
         """
         Sets min/max values and initial values based on VSS attributes or VHAL type defaults.
+        vss_type_lower is the lowercased datatype, if the caller already has it.
         """
         # Set min/max values from VSS attributes
         if signal_node.vss_min is not None:
@@ -260,29 +437,54 @@ class PropertyEnricher:
             signal_node.max_value = float(signal_node.vss_max)
             
         # Set initial value based on VSS default or type defaults
-        if hasattr(signal_node, 'vss_default') and signal_node.vss_default is not None:
+        if signal_node.vss_default is not None:
             signal_node.initial_value = signal_node.vss_default
         else:
             # Set default initial values based on VHAL type
             vhal_type = getattr(signal_node, 'vhal_type', VhalPropertyType.MIXED)
             if vhal_type == VhalPropertyType.BOOLEAN:
                 signal_node.initial_value = False
-            elif vhal_type in [VhalPropertyType.INT32, VhalPropertyType.INT64]:
+            elif vhal_type in _INTEGER_VHAL_TYPES:
                 signal_node.initial_value = 0
             elif vhal_type == VhalPropertyType.FLOAT:
                 signal_node.initial_value = 0.0
             elif vhal_type == VhalPropertyType.STRING:
                 signal_node.initial_value = ""
-            elif vhal_type in [VhalPropertyType.INT32_VEC, VhalPropertyType.FLOAT_VEC]:
+            elif vhal_type in _VECTOR_VHAL_TYPES:
                 signal_node.initial_value = []
             else:
                 # For MIXED or unknown types
                 signal_node.initial_value = None
                 
         # Also try to get default from typemap if available
-        if not hasattr(signal_node, 'initial_value') or signal_node.initial_value is None:
+        if signal_node.initial_value is None:
             vss_type = signal_node.datatype
-            if vss_type and vss_type.lower() in self.typemap:
-                type_config = self.typemap.get(vss_type.lower(), {})
-                if 'default_value' in type_config:
-                    signal_node.initial_value = type_config['default_value']
+            if vss_type:
+                if vss_type_lower is None:
+                    vss_type_lower = vss_type.lower()
+                if vss_type_lower in self._typemap_default_values:
+                    signal_node.initial_value = self._typemap_default_values[vss_type_lower]
+
+
+# Per-process enricher used by PropertyEnricher._enrich_in_processes
+_worker_enricher: Optional[PropertyEnricher] = None
+
+def _init_enrich_worker(property_heuristics: Dict, typemap: Dict, unit_conversion_rules: Dict):
+    """Process pool initializer: builds the worker's PropertyEnricher once."""
+    global _worker_enricher
+    _worker_enricher = PropertyEnricher(property_heuristics, typemap, unit_conversion_rules)
+
+# SignalNode fields copied back from workers; leaves have no children, so the tree links stay untouched
+_ENRICHED_NODE_FIELDS = tuple(f.name for f in fields(SignalNode) if f.name != 'children')
+
+def _enrich_chunk(signal_nodes: List[SignalNode]) -> Tuple[List[List[Any]], Counter]:
+    """
+    Enriches a chunk of leaf SignalNodes in a worker and returns their field
+    values along with the chunk's unknown-datatype counts.
+    """
+    _worker_enricher._unknown_type_counts.clear()
+    enriched_attributes = []
+    for signal_node in signal_nodes:
+        _worker_enricher._enrich_single_signal(signal_node)
+        enriched_attributes.append([getattr(signal_node, field_name) for field_name in _ENRICHED_NODE_FIELDS])
+    return enriched_attributes, _worker_enricher._unknown_type_counts
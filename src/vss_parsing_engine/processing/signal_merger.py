@@ -1,7 +1,8 @@
 # Combines enriched VSS signals into unified_signal_model.json
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from vss_parsing_engine.models.signal import SignalNode
+from vss_parsing_engine.models.constants import VSS_LEAF_NODE_TYPES
 
 class SignalMerger:
     """
@@ -15,7 +16,8 @@ class SignalMerger:
     """
 
     def merge_and_flatten_signals(self,
-                                  enriched_signals: Dict[str, SignalNode]) -> Dict[str, Any]:
+                                  enriched_signals: Dict[str, SignalNode],
+                                  leaf_paths: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Takes a dictionary of enriched SignalNode objects (which may represent
         a hierarchy internally) and flattens them into a single dictionary
@@ -25,6 +27,9 @@ class SignalMerger:
         Args:
             enriched_signals (Dict[str, SignalNode]): A dictionary of SignalNode objects,
                 keyed by their full VSS path, after being enriched by the PropertyEnricher.
+            leaf_paths (List[str], optional): Paths of the data-carrying nodes in
+                enriched_signals (VSSParser.leaf_paths); when given, branch nodes are
+                not visited at all.
 
         Returns:
             Dict[str, Any]: A flattened dictionary where keys are the full VSS paths
@@ -36,15 +41,19 @@ class SignalMerger:
         unified_model = {}
         processed_count = 0
 
-        # Iterate through all nodes.
-        for path, signal_node in enriched_signals.items():
+        # The input is already keyed by full path, so a single flat pass visits every node once.
+        if leaf_paths is None:
+            signal_items = enriched_signals.items()
+        else:
+            signal_items = ((path, enriched_signals[path]) for path in leaf_paths)
+        for path, signal_node in signal_items:
             # Corrected condition: Include if node_type is a data-carrying type AND has required data
-            if (signal_node.node_type in ["signal", "sensor", "actuator", "attribute"] and
-                hasattr(signal_node, 'datatype') and signal_node.datatype and
-                hasattr(signal_node, 'description') and signal_node.description and 
-                signal_node.description.strip() and
-                hasattr(signal_node, 'vhal_id') and signal_node.vhal_id):
-                unified_model[path] = signal_node.to_dict()
+            if (signal_node.node_type in VSS_LEAF_NODE_TYPES and
+                signal_node.datatype and
+                signal_node.description and signal_node.description.strip() and
+                signal_node.vhal_id):
+                # Leaves carry no children, so skip building the nested 'children' dict
+                unified_model[path] = signal_node.to_dict_self_only()
                 processed_count += 1
             # Branch nodes (node_type == "branch") or nodes without proper data are organizational 
             # and are not typically included as distinct properties in the flattened VHAL model.
@@ -0,0 +1,93 @@
+# File: tests/test_model_cache.py
+
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from vss_parsing_engine.main import vss_to_json, json_to_vhal
+
+PACKAGE_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'vss_parsing_engine')
+CONFIG_DIR = os.path.join(PACKAGE_DIR, 'config')
+TEMPLATES_DIR = os.path.join(PACKAGE_DIR, 'generator', 'templates')
+
+# Signals whose bounds are infinite: orjson alone would write them as null
+INFINITE_BOUNDS_VSS = """\
+Vehicle:
+  type: branch
+  description: High-level vehicle data.
+
+Vehicle.Speed:
+  type: sensor
+  datatype: float
+  unit: km/h
+  description: Vehicle speed.
+  min: -.inf
+  max: .inf
+
+Vehicle.Acceleration:
+  type: sensor
+  datatype: double
+  description: Longitudinal acceleration.
+  min: 0
+  max: .inf
+"""
+
+class ModelCacheTest(unittest.TestCase):
+    """The cached signal model must generate exactly what a fresh parse generates."""
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.vss_file = os.path.join(self.work_dir.name, 'infinite.vspec')
+        with open(self.vss_file, 'w', encoding='utf-8') as f:
+            f.write(INFINITE_BOUNDS_VSS)
+        self.json_file = os.path.join(self.work_dir.name, 'unified_signal_model.json')
+        self.cache_dir = os.path.join(self.work_dir.name, 'cache')
+        cache_env = mock.patch.dict(os.environ, {'VSS_PARSING_ENGINE_CACHE_DIR': self.cache_dir})
+        cache_env.start()
+        self.addCleanup(cache_env.stop)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def _run(self, output_name):
+        """Runs both pipeline steps; returns (model, stdout, {file: contents})."""
+        output_dir = os.path.join(self.work_dir.name, output_name)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            model, json_write = vss_to_json(self.vss_file, self.json_file, CONFIG_DIR, write_json=False)
+            json_to_vhal(self.json_file, output_dir, TEMPLATES_DIR, signals=model)
+            if json_write is not None:
+                json_write.result()
+        generated = {}
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    generated[os.path.relpath(path, output_dir)] = f.read()
+        return model, stdout.getvalue(), generated
+
+    def test_cached_run_matches_cold_run_for_infinite_bounds(self):
+        cold_model, cold_stdout, cold_files = self._run('cold')
+        cached_model, cached_stdout, cached_files = self._run('cached')
+
+        self.assertNotIn('reusing cached signal model', cold_stdout)
+        self.assertIn('reusing cached signal model', cached_stdout)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertEqual(sorted(os.listdir(self.work_dir.name)), ['cache', 'cached', 'cold', 'infinite.vspec'])
+        self.assertTrue(any(isinstance(value, float) and math.isinf(value)
+                            for signal in cold_model.values() for value in signal.values()))
+        self.assertEqual(cached_model, cold_model)
+        self.assertTrue(cold_files)
+        self.assertEqual(sorted(cached_files), sorted(cold_files))
+        for name, contents in cold_files.items():
+            self.assertEqual(cached_files[name], contents, name)
+
+if __name__ == '__main__':
+    unittest.main()